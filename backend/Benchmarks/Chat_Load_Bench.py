@@ -0,0 +1,136 @@
+"""
+Load test for the chat endpoints of a running instance. Start the API with GENAI_PROVIDER=fake
+to measure the request path (auth, DB, prompt assembly, persistence) without Gemini quota:
+
+    GENAI_PROVIDER=fake FAKE_GENAI_LATENCY_MS=600 uvicorn backend.Main:app --workers 2
+    python -m backend.Benchmarks.Chat_Load_Bench --email bench@example.com --password secret \\
+        --requests 500 --concurrency 50 --mode stream
+
+Reports requests/sec and latency percentiles; for --mode stream also time to first byte
+and time to first token.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+    return {"p50_ms": at(0.50), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": ordered[-1] * 1000}
+
+
+async def _chat(client: httpx.AsyncClient, query: str) -> dict:
+    started = time.perf_counter()
+    response = await client.post("/system/chat", json={"user_query": query})
+    return {"ok": response.status_code == 200, "status": response.status_code, "total": time.perf_counter() - started}
+
+
+async def _stream(client: httpx.AsyncClient, query: str) -> dict:
+    started = time.perf_counter()
+    first_byte = first_token = None
+    ok = False
+    async with client.stream("POST", "/system/chat/stream", json={"user_query": query}) as response:
+        event = None
+        async for line in response.aiter_lines():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            if line.startswith("event: "):
+                event = line[7:]
+                if event == "token" and first_token is None:
+                    first_token = time.perf_counter() - started
+            ok = ok or event == "done"
+        status = response.status_code
+    return {
+        "ok": ok,
+        "status": status,
+        "total": time.perf_counter() - started,
+        "first_byte": first_byte,
+        "first_token": first_token,
+    }
+
+
+async def run(url: str, token: str, mode: str, requests: int, concurrency: int) -> dict:
+    send = _stream if mode == "stream" else _chat
+    slots = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=limits,
+        timeout=120,
+    ) as client:
+        async def one(index: int) -> dict:
+            async with slots:
+                try:
+                    return await send(client, f"Benchmark question {index}: is my cholesterol okay?")
+                except httpx.HTTPError as e:
+                    return {"ok": False, "status": type(e).__name__, "total": 0.0}
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    succeeded = [r for r in results if r["ok"]]
+    statuses: dict[str, int] = {}
+    for r in results:
+        if not r["ok"]:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+
+    summary = {
+        "mode": mode,
+        "requests": requests,
+        "concurrency": concurrency,
+        "succeeded": len(succeeded),
+        "failed_by_status": statuses,
+        "seconds": elapsed,
+        "requests_per_sec": len(succeeded) / elapsed if elapsed else 0.0,
+        "latency": _percentiles([r["total"] for r in succeeded]),
+    }
+    if mode == "stream":
+        summary["first_byte"] = _percentiles([r["first_byte"] for r in succeeded if r.get("first_byte") is not None])
+        summary["first_token"] = _percentiles([r["first_token"] for r in succeeded if r.get("first_token") is not None])
+    return summary
+
+
+async def _login(url: str, email: str, password: str) -> str:
+    async with httpx.AsyncClient(base_url=url) as client:
+        response = await client.post("/auth/login", json={"email": email, "password": password})
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", default=None, help="access token; or use --email/--password")
+    parser.add_argument("--email", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--mode", choices=["chat", "stream"], default="chat")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    token = args.token
+    if token is None:
+        if not (args.email and args.password):
+            parser.error("pass --token or both --email and --password")
+        token = asyncio.run(_login(args.url, args.email, args.password))
+
+    summary = asyncio.run(run(args.url, token, args.mode, max(1, args.requests), max(1, args.concurrency)))
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["succeeded"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Throughput and accuracy benchmark for Services/PDF_Extractor.py on a synthetic lab-report corpus.
+
+    python -m backend.Benchmarks.PDF_Extraction_Bench --reports 60 --save-baseline bench.json
+    python -m backend.Benchmarks.PDF_Extraction_Bench --reports 60 --compare bench.json
+    python -m backend.Benchmarks.PDF_Extraction_Bench --backend pdfminer
+
+Exits with status 1 when a comparison finds a regression beyond the tolerance.
+"""
+import argparse
+import json
+import platform
+import re
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ..Services.Biomarker_Scanner import ANALYTES, scan_biomarkers
+from ..Services.PDF_Extractor import PDF_TEXT_BACKENDS, extract_health_report, extract_text_from_pdf
+from .Synthetic_Reports import SyntheticReport, generate_corpus
+
+# Metric name -> True when a larger value is better.
+TRACKED = {
+    "pages_per_sec": True,
+    "full_pages_per_sec": True,
+    "scan_ms_per_report": False,
+    "peak_traced_mb": False,
+    "accuracy": True,
+}
+
+
+def _matches(expected, actual) -> bool:
+    if expected is None or actual is None:
+        return expected is actual
+    if isinstance(expected, str):
+        return expected == actual
+    return abs(float(expected) - float(actual)) < 1e-6
+
+
+def _per_field_ms(texts: list[str]) -> dict[str, float]:
+    """Cost of each analyte's aliases in isolation, per report, to spot an expensive pattern."""
+    timings = {}
+    for analyte in ANALYTES:
+        patterns = [re.compile(alias, re.IGNORECASE) for alias in analyte.aliases]
+        started = time.perf_counter()
+        for text in texts:
+            for pattern in patterns:
+                if pattern.search(text):
+                    break
+        timings[analyte.name] = (time.perf_counter() - started) * 1000 / max(len(texts), 1)
+    return timings
+
+
+def run(corpus: list[tuple[Path, SyntheticReport]], page_budget: int | None, backend: str) -> dict:
+    total_pages = sum(report.page_count for _, report in corpus)
+
+    started = time.perf_counter()
+    full_texts = [extract_text_from_pdf(path, backend) for path, _ in corpus]
+    full_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    extracted = [extract_health_report(path, page_budget, backend) for path, _ in corpus]
+    lazy_seconds = time.perf_counter() - started
+
+    # Separate pass: tracemalloc slows allocation-heavy code too much to time under it.
+    tracemalloc.start()
+    for path, _ in corpus:
+        extract_health_report(path, page_budget, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for text in full_texts:
+        scan_biomarkers(text)
+    scan_seconds = time.perf_counter() - started
+
+    pages_parsed = sum(result.pages_parsed for result in extracted)
+    correct = 0
+    checked = 0
+    field_hits = {analyte.name: 0 for analyte in ANALYTES}
+    for (_, report), result in zip(corpus, extracted):
+        for name, expected in report.expected.items():
+            checked += 1
+            if _matches(expected, result.fields.get(name)):
+                correct += 1
+                field_hits[name] += 1
+
+    return {
+        "reports": len(corpus),
+        "pages_total": total_pages,
+        "pages_parsed": pages_parsed,
+        "fallbacks": sum(result.fell_back for result in extracted),
+        "pages_per_sec": pages_parsed / lazy_seconds if lazy_seconds else 0.0,
+        "full_pages_per_sec": total_pages / full_seconds if full_seconds else 0.0,
+        "scan_ms_per_report": scan_seconds * 1000 / max(len(corpus), 1),
+        "field_scan_ms_per_report": _per_field_ms(full_texts),
+        "peak_traced_mb": peak / (1024 * 1024),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "accuracy": correct / checked if checked else 0.0,
+        "field_accuracy": {name: hits / len(corpus) for name, hits in field_hits.items()},
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for metric, higher_is_better in TRACKED.items():
+        old, new = baseline.get(metric), current.get(metric)
+        if old is None or new is None or old == 0:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        # Accuracy is deterministic for a seeded corpus, so any drop counts.
+        limit = 0.0 if metric == "accuracy" else tolerance
+        if worse > limit:
+            regressions.append(f"{metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--page-budget", type=int, default=40)
+    parser.add_argument("--backend", choices=sorted(PDF_TEXT_BACKENDS), default="pdfplumber")
+    parser.add_argument("--corpus-dir", type=Path, default=None)
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus_dir = args.corpus_dir or Path(scratch)
+        corpus = generate_corpus(corpus_dir, args.reports, args.seed)
+        results = run(corpus, args.page_budget, args.backend)
+
+    results["config"] = {
+        "reports": args.reports,
+        "seed": args.seed,
+        "page_budget": args.page_budget,
+        "backend": args.backend,
+        "python": platform.python_version(),
+    }
+    print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2))
+        print(f"[Bench] Baseline written to {args.save_baseline}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("[Bench] Regressions against baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("[Bench] No regressions against baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
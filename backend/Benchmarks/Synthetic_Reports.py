@@ -0,0 +1,168 @@
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Label spellings per field, each matching one of the aliases in Services/Biomarker_Scanner.py.
+SPELLINGS: dict[str, list[str]] = {
+    "ldl_cholesterol": ["LDL Cholesterol", "LDL-Cholesterol", "LDL", "Low Density Lipoprotein"],
+    "hdl_cholesterol": ["HDL Cholesterol", "HDL-Cholesterol", "HDL", "High Density Lipoprotein"],
+    "triglycerides": ["Triglycerides", "Triglyceride", "TG"],
+    "hba1c": ["HbA1c", "Glycated Haemoglobin", "Glycohaemoglobin"],
+    "fasting_glucose": ["Fasting Glucose", "Fasting-Glucose", "Blood Glucose Fasting", "FBS", "F. Blood Sugar"],
+    "haemoglobin": ["Haemoglobin", "Hb", "HGB"],
+    "wbc_count": ["WBC Count", "White Blood Cell Count", "TLC"],
+    "platelet_count": ["Platelet Count", "PLT"],
+    "alt_ast": ["ALT", "SGPT", "Alanine Aminotransferase"],
+    "egfr": ["eGFR", "Estimated GFR"],
+    "resting_heart_rate": ["Resting Heart Rate", "Heart Rate", "Pulse Rate"],
+    "blood_pressure": ["Blood Pressure", "BloodPressure"],
+    "spo2": ["SpO2", "Oxygen Saturation"],
+}
+
+UNITS: dict[str, str] = {
+    "ldl_cholesterol": "mg/dL",
+    "hdl_cholesterol": "mg/dL",
+    "triglycerides": "mg/dL",
+    "hba1c": "%",
+    "fasting_glucose": "mg/dL",
+    "haemoglobin": "g/dL",
+    "wbc_count": "cells/uL",
+    "platelet_count": "cells/uL",
+    "alt_ast": "U/L",
+    "egfr": "mL/min/1.73m2",
+    "resting_heart_rate": "bpm",
+    "blood_pressure": "mmHg",
+    "spo2": "%",
+}
+
+LAYOUTS = ("colon", "table", "scattered")
+
+FILLER = [
+    "Sample collected at the main laboratory under fasting conditions.",
+    "Results should be interpreted in the context of the clinical history.",
+    "Reference intervals are specific to the method used by this laboratory.",
+    "This report is electronically generated and does not require a signature.",
+    "Please consult your physician for interpretation of these results.",
+]
+
+
+@dataclass
+class SyntheticReport:
+    name: str
+    layout: str
+    pages: list[list[str]]
+    expected: dict = field(default_factory=dict)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+
+def _value(rng: random.Random, name: str):
+    if name == "blood_pressure":
+        return f"{rng.randint(95, 170)}/{rng.randint(55, 105)}"
+    if name in ("wbc_count", "platelet_count"):
+        return rng.randint(3000, 450000)
+    if name == "resting_heart_rate":
+        return rng.randint(48, 120)
+    if name == "hba1c":
+        return round(rng.uniform(4.5, 11.0), 1)
+    if name == "spo2":
+        return round(rng.uniform(88.0, 100.0), 1)
+    return round(rng.uniform(5.0, 260.0), 1)
+
+
+def _line(rng: random.Random, layout: str, name: str, value) -> str:
+    label = rng.choice(SPELLINGS[name])
+    unit = UNITS[name]
+    if layout == "table":
+        return f"{label}    {value}    {unit}    ref: see note"
+    return f"{label}: {value} {unit}"
+
+
+def build_report(rng: random.Random, index: int) -> SyntheticReport:
+    layout = LAYOUTS[index % len(LAYOUTS)]
+    page_count = rng.choice((1, 1, 2, 3, 5, 8, 12))
+    pages: list[list[str]] = [
+        [f"MedBrief Diagnostics - Report #{index:05d}", f"Page {p + 1} of {page_count}", ""]
+        for p in range(page_count)
+    ]
+
+    fields = list(SPELLINGS)
+    present = [f for f in fields if rng.random() > 0.1]
+    expected = {f: None for f in fields}
+
+    for name in present:
+        value = _value(rng, name)
+        expected[name] = value
+        if layout == "scattered":
+            page = rng.randrange(page_count)
+        else:
+            page = 0 if page_count < 3 else rng.randrange(min(2, page_count))
+        pages[page].append(_line(rng, layout, name, value))
+
+    for lines in pages:
+        for _ in range(rng.randint(3, 25)):
+            lines.append(rng.choice(FILLER))
+
+    return SyntheticReport(name=f"report_{index:05d}", layout=layout, pages=pages, expected=expected)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(report: SyntheticReport) -> bytes:
+    """Writes a minimal single-font PDF so the benchmark needs no PDF authoring dependency."""
+    objects: list[bytes] = []
+    page_ids: list[int] = []
+    first_page_id = 4
+
+    for index, lines in enumerate(report.pages):
+        page_id = first_page_id + index * 2
+        content_id = page_id + 1
+        page_ids.append(page_id)
+
+        stream = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        for line in lines[:55]:
+            stream.append(f"({_escape(line)}) Tj T*")
+        stream.append("ET")
+        body = "\n".join(stream).encode("latin-1", "replace")
+
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(body) + body + b"\nendstream")
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    header = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets: list[int] = []
+    for number, obj in enumerate(header + objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+
+    xref_at = len(out)
+    out += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def generate_corpus(directory: Path, count: int, seed: int = 7) -> list[tuple[Path, SyntheticReport]]:
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        report = build_report(rng, index)
+        path = directory / f"{report.name}.pdf"
+        path.write_bytes(render_pdf(report))
+        corpus.append((path, report))
+    return corpus
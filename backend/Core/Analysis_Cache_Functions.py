@@ -0,0 +1,37 @@
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..Models.Medical_Data import AnalysisCacheEntry
+from ..Security.Settings import settings
+
+
+def find_cached_analysis(db: Session, key: str) -> Optional[dict]:
+    cutoff = func.now() - timedelta(days=settings.ANALYSIS_CACHE_TTL_DAYS)
+    entry = (
+        db.query(AnalysisCacheEntry)
+        .filter(AnalysisCacheEntry.key == key, AnalysisCacheEntry.created_at >= cutoff)
+        .first()
+    )
+    return entry.result if entry else None
+
+
+def store_cached_analysis(db: Session, key: str, prompt_version: str, model: str, result: dict) -> None:
+    """Upserts one entry and drops expired ones. Does not commit; it lands with the analysis row."""
+    statement = insert(AnalysisCacheEntry).values(
+        key=key,
+        prompt_version=prompt_version,
+        model=model,
+        result=result,
+        created_at=func.now(),
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[AnalysisCacheEntry.key],
+        set_={"result": statement.excluded.result, "created_at": func.now()},
+    ))
+
+    cutoff = func.now() - timedelta(days=settings.ANALYSIS_CACHE_TTL_DAYS)
+    db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.created_at < cutoff).delete(synchronize_session=False)
@@ -0,0 +1,115 @@
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..Models.Medical_Data import AnalysisJob
+from ..Security.Settings import settings
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: UUID
+    report_id: UUID
+    attempts: int
+
+
+def enqueue_analysis_jobs(db: Session, report_ids: list[UUID]) -> list[UUID]:
+    """
+    Queues analysis for each report, or re-queues it if its job has failed for good. Reports
+    whose job is still queued or running are left alone. Returns the ids actually queued.
+    Does not commit, so the caller can commit the jobs in the same transaction as the
+    reports they belong to.
+    """
+    if not report_ids:
+        return []
+    statement = insert(AnalysisJob).values([
+        {"report_id": report_id, "status": "queued", "attempts": 0, "run_after": func.now()}
+        for report_id in report_ids
+    ])
+    # Finished jobs are deleted, so a conflicting row is either failed or still in flight.
+    statement = statement.on_conflict_do_update(
+        index_elements=[AnalysisJob.report_id],
+        set_={
+            "status": "queued",
+            "attempts": 0,
+            "last_error": None,
+            "run_after": func.now(),
+            "locked_at": None,
+        },
+        where=AnalysisJob.status == "failed",
+    ).returning(AnalysisJob.report_id)
+    return list(db.scalars(statement))
+
+
+def claim_analysis_jobs(db: Session, limit: int) -> list[ClaimedJob]:
+    """
+    Locks up to `limit` due jobs with FOR UPDATE SKIP LOCKED so concurrent workers never
+    claim the same row. Jobs left running past the lease (a crashed worker) are reclaimed.
+    """
+    stale = func.now() - timedelta(seconds=settings.ANALYSIS_JOB_LEASE_SECONDS)
+    jobs = (
+        db.query(AnalysisJob)
+        .filter(or_(
+            and_(AnalysisJob.status == "queued", AnalysisJob.run_after <= func.now()),
+            and_(AnalysisJob.status == "running", AnalysisJob.locked_at < stale),
+        ))
+        .order_by(AnalysisJob.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for job in jobs:
+        job.status = "running"
+        job.locked_at = func.now()
+        job.attempts += 1
+        claimed.append(ClaimedJob(id=job.id, report_id=job.report_id, attempts=job.attempts))
+    db.commit()
+    return claimed
+
+
+def claim_report_analysis(db: Session, report_ids: list[UUID]) -> list[ClaimedJob]:
+    """
+    Claims analysis of these reports outside the worker loop: each gets a running job, or its
+    failed job is taken over, exactly as if a worker had claimed it. Reports whose job is
+    queued or running elsewhere are skipped. Does not commit.
+    """
+    if not report_ids:
+        return []
+    claim = {"status": "running", "attempts": 1, "last_error": None, "run_after": func.now(), "locked_at": func.now()}
+    statement = insert(AnalysisJob).values([{"report_id": report_id, **claim} for report_id in report_ids])
+    statement = statement.on_conflict_do_update(
+        index_elements=[AnalysisJob.report_id],
+        set_=claim,
+        where=AnalysisJob.status == "failed",
+    ).returning(AnalysisJob.id, AnalysisJob.report_id, AnalysisJob.attempts)
+    return [ClaimedJob(id=row.id, report_id=row.report_id, attempts=row.attempts) for row in db.execute(statement)]
+
+
+def finish_analysis_job(db: Session, job_id: UUID) -> None:
+    db.query(AnalysisJob).filter(AnalysisJob.id == job_id).delete(synchronize_session=False)
+
+
+def fail_analysis_job(db: Session, job: ClaimedJob, error: str) -> bool:
+    """
+    Schedules a retry with jittered exponential backoff. Returns True once the job has
+    used up its attempts and is marked failed for good.
+    """
+    exhausted = job.attempts >= settings.ANALYSIS_JOB_MAX_ATTEMPTS
+    delay = settings.ANALYSIS_JOB_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+    delay *= random.uniform(0.5, 1.0)
+    db.query(AnalysisJob).filter(AnalysisJob.id == job.id).update(
+        {
+            "status": "failed" if exhausted else "queued",
+            "last_error": error[:2000],
+            "run_after": func.now() + timedelta(seconds=delay),
+            "locked_at": None,
+        },
+        synchronize_session=False,
+    )
+    return exhausted
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..Models.Medical_Data import ClinicalSnapshot, HealthData, MedicalAnalysis
+from ..Schemas.Medical_Data_Schema import HealthDataBase, MedicalAnalysisBase
+from ..Security.Settings import settings
+
+
+@dataclass(frozen=True)
+class ClinicalSnapshotData:
+    user_id: UUID
+    report_id: UUID
+    report_created_at: Optional[datetime]
+    analysis_status: str
+    biomarkers: HealthDataBase
+    analysis: Optional[MedicalAnalysisBase]
+
+
+class _SnapshotCache:
+    """
+    Per-process LRU of snapshots. Refreshes in this process invalidate their entry at once;
+    the TTL bounds how long another worker's refresh can go unnoticed.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[UUID, tuple[float, Optional[ClinicalSnapshotData]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID) -> tuple[bool, Optional[ClinicalSnapshotData]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                return False, None
+            self._entries.move_to_end(user_id)
+            return True, entry[1]
+
+    def put(self, user_id: UUID, snapshot: Optional[ClinicalSnapshotData]) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+snapshot_cache = _SnapshotCache(settings.CLINICAL_SNAPSHOT_CACHE_ENTRIES, settings.CLINICAL_SNAPSHOT_CACHE_TTL_SECONDS)
+
+
+def _to_data(row: ClinicalSnapshot) -> ClinicalSnapshotData:
+    return ClinicalSnapshotData(
+        user_id=row.user_id,
+        report_id=row.report_id,
+        report_created_at=row.report_created_at,
+        analysis_status=row.analysis_status,
+        biomarkers=HealthDataBase(**row.biomarkers),
+        analysis=MedicalAnalysisBase(**row.analysis) if row.analysis else None,
+    )
+
+
+def get_clinical_snapshot(db: Session, user_id: UUID) -> Optional[ClinicalSnapshotData]:
+    """One cache lookup, or one primary-key read on a miss. Users without reports get None."""
+    hit, snapshot = snapshot_cache.get(user_id)
+    if hit:
+        return snapshot
+
+    row = db.get(ClinicalSnapshot, user_id)
+    snapshot = _to_data(row) if row else None
+    snapshot_cache.put(user_id, snapshot)
+    return snapshot
+
+
+def refresh_clinical_snapshot(db: Session, user_id: UUID) -> None:
+    refresh_clinical_snapshots(db, [user_id])
+
+
+def refresh_clinical_snapshots(db: Session, user_ids: Iterable[UUID]) -> None:
+    """
+    Rebuilds the snapshot of each user from their newest report and its newest analysis,
+    commits, then drops the users from this process's cache. Call after a report is created,
+    analysed or re-parsed.
+    """
+    user_ids = rebuild_clinical_snapshots(db, user_ids)
+    db.commit()
+    for user_id in user_ids:
+        snapshot_cache.invalidate(user_id)
+
+
+def rebuild_clinical_snapshots(db: Session, user_ids: Iterable[UUID]) -> list[UUID]:
+    """
+    Writes the snapshots on the caller's transaction, including its unflushed changes, so they
+    commit together with the report or analysis they reflect. The caller invalidates the cache
+    entries after committing. Returns the users rebuilt.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return user_ids
+
+    db.flush()
+    for user_id in user_ids:
+        report = (
+            db.query(HealthData)
+            .filter(HealthData.user_id == user_id)
+            .order_by(HealthData.created_at.desc())
+            .first()
+        )
+        if report is None:
+            db.query(ClinicalSnapshot).filter(ClinicalSnapshot.user_id == user_id).delete(synchronize_session=False)
+            continue
+
+        analysis = (
+            db.query(MedicalAnalysis)
+            .filter(MedicalAnalysis.report_id == report.id)
+            .order_by(MedicalAnalysis.created_at.desc())
+            .first()
+        )
+        values = {
+            "report_id": report.id,
+            "report_created_at": report.created_at,
+            "analysis_status": report.analysis_status,
+            "biomarkers": HealthDataBase.model_validate(report, from_attributes=True).model_dump(),
+            "analysis": (
+                MedicalAnalysisBase.model_validate(analysis, from_attributes=True).model_dump()
+                if analysis else None
+            ),
+        }
+        statement = insert(ClinicalSnapshot).values(user_id=user_id, **values)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[ClinicalSnapshot.user_id],
+            set_={**values, "updated_at": func.now()},
+        ))
+    return user_ids
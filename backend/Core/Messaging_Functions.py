@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import case, func, select, true, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from ..Models.Auth_Data import Auth_User
+from ..Models.Messaging import Conversation, DirectMessage
+from ..Schemas.Message_Schema import ConversationParticipant, ConversationSummary
+
+LAST_MESSAGE_PREVIEW_CHARS = 120
+
+
+def list_inbox(
+    db: Session,
+    user_id: UUID,
+    limit: int,
+    before: Optional[datetime] = None,
+    before_id: Optional[UUID] = None,
+) -> list[ConversationSummary]:
+    """
+    One page of the user's conversations, most recent activity first, in a single query:
+    the page of conversations, the other participant, the newest message (lateral join)
+    and unread counts grouped over just that page. Pass the `last_message_at` and `id` of
+    the previous page's final entry as `before` / `before_id` to fetch the next page.
+    """
+    if (before is None) != (before_id is None):
+        raise ValueError("before and before_id must be given together.")
+
+    # Conversations without messages sort by creation time.
+    activity = func.coalesce(Conversation.last_message_at, Conversation.created_at)
+
+    def side(participant):
+        # Each side walks its own (participant, activity, id) index, so only `limit` rows are read.
+        query = select(
+            Conversation.id,
+            Conversation.doctor_user_id,
+            Conversation.patient_user_id,
+            Conversation.created_at,
+            activity.label("activity"),
+        ).where(participant == user_id)
+        if before is not None:
+            query = query.where(tuple_(activity, Conversation.id) < tuple_(before, before_id))
+        return query.order_by(activity.desc(), Conversation.id.desc()).limit(limit)
+
+    sides = union_all(side(Conversation.doctor_user_id), side(Conversation.patient_user_id)).subquery("inbox_sides")
+    page = select(sides).order_by(sides.c.activity.desc(), sides.c.id.desc()).limit(limit).cte("inbox_page")
+
+    other_user_id = case(
+        (page.c.doctor_user_id == user_id, page.c.patient_user_id),
+        else_=page.c.doctor_user_id,
+    )
+    last_message = (
+        select(func.left(DirectMessage.content, LAST_MESSAGE_PREVIEW_CHARS).label("preview"))
+        .where(DirectMessage.conversation_id == page.c.id)
+        .order_by(DirectMessage.created_at.desc(), DirectMessage.id.desc())
+        .limit(1)
+        .lateral("last_message")
+    )
+    unread = (
+        select(DirectMessage.conversation_id, func.count().label("unread_count"))
+        .where(
+            DirectMessage.conversation_id.in_(select(page.c.id)),
+            DirectMessage.sender_id != user_id,
+            DirectMessage.is_read == False,  # noqa: E712
+        )
+        .group_by(DirectMessage.conversation_id)
+        .subquery("unread")
+    )
+
+    rows = db.execute(
+        select(
+            page,
+            Auth_User.id.label("other_id"),
+            Auth_User.username,
+            Auth_User.role,
+            last_message.c.preview,
+            func.coalesce(unread.c.unread_count, 0).label("unread_count"),
+        )
+        .join(Auth_User, Auth_User.id == other_user_id)
+        .outerjoin(last_message, true())
+        .outerjoin(unread, unread.c.conversation_id == page.c.id)
+        .order_by(page.c.activity.desc(), page.c.id.desc())
+    )
+
+    return [
+        ConversationSummary(
+            id=row.id,
+            doctor_user_id=row.doctor_user_id,
+            patient_user_id=row.patient_user_id,
+            created_at=row.created_at,
+            last_message_at=row.activity,
+            other_user=ConversationParticipant(id=row.other_id, username=row.username, role=row.role),
+            last_message_preview=row.preview,
+            unread_count=row.unread_count,
+        )
+        for row in rows
+    ]
+
+
+def list_messages(
+    db: Session,
+    conversation_id: UUID,
+    limit: int,
+    before: Optional[DirectMessage] = None,
+    after: Optional[DirectMessage] = None,
+) -> list[DirectMessage]:
+    """
+    Up to `limit` messages in chronological order: the newest ones, those just before
+    `before`, or those just after `after`. Messages are ordered by (created_at, id), so
+    messages sharing a timestamp keep a stable order across pages.
+    """
+    position = tuple_(DirectMessage.created_at, DirectMessage.id)
+    query = db.query(DirectMessage).filter(DirectMessage.conversation_id == conversation_id)
+
+    if after is not None:
+        return (
+            query.filter(position > tuple_(after.created_at, after.id))
+            .order_by(DirectMessage.created_at.asc(), DirectMessage.id.asc())
+            .limit(limit)
+            .all()
+        )
+
+    if before is not None:
+        query = query.filter(position < tuple_(before.created_at, before.id))
+    newest_first = query.order_by(DirectMessage.created_at.desc(), DirectMessage.id.desc()).limit(limit).all()
+    return newest_first[::-1]
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..Models.Medical_Data import HealthData, ReportDigest
+from ..Security.Settings import settings
+
+
+def find_cached_report(db: Session, user_id: UUID, content_sha256: str) -> Optional[HealthData]:
+    """Returns the report previously extracted from this exact file for this user, if still retained."""
+    cutoff = func.now() - timedelta(days=settings.REPORT_DEDUPE_TTL_DAYS)
+    digest = (
+        db.query(ReportDigest)
+        .filter(
+            ReportDigest.user_id == user_id,
+            ReportDigest.content_sha256 == content_sha256,
+            ReportDigest.created_at >= cutoff,
+        )
+        .first()
+    )
+    if not digest or not digest.report:
+        return None
+
+    digest.last_used_at = func.now()
+    db.commit()
+    return digest.report
+
+
+def remember_report(db: Session, user_id: UUID, content_sha256: str, report_id: UUID) -> None:
+    remember_reports(db, user_id, [(content_sha256, report_id)])
+
+
+def remember_reports(db: Session, user_id: UUID, entries: list[tuple[str, UUID]]) -> None:
+    """
+    Records (content_sha256, report_id) pairs for one owner, then applies eviction once.
+    One upsert on uq_report_digest_user_sha, so two requests remembering the same file
+    at once both succeed and the later one's report wins.
+    """
+    if not entries:
+        return
+
+    # A digest may appear only once per INSERT ... ON CONFLICT statement; the last entry wins.
+    reports_by_digest = dict(entries)
+    statement = insert(ReportDigest).values([
+        {"id": uuid4(), "user_id": user_id, "content_sha256": content_sha256, "report_id": report_id}
+        for content_sha256, report_id in reports_by_digest.items()
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[ReportDigest.user_id, ReportDigest.content_sha256],
+        set_={
+            "report_id": statement.excluded.report_id,
+            "created_at": func.now(),
+            "last_used_at": func.now(),
+        },
+    ))
+
+    evict_report_digests(db, user_id)
+    db.commit()
+
+
+def evict_report_digests(db: Session, user_id: UUID) -> int:
+    """Drops digests past the TTL and keeps only the most recently used entries per user."""
+    cutoff = func.now() - timedelta(days=settings.REPORT_DEDUPE_TTL_DAYS)
+    removed = (
+        db.query(ReportDigest)
+        .filter(ReportDigest.user_id == user_id, ReportDigest.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+
+    keep = (
+        db.query(ReportDigest.id)
+        .filter(ReportDigest.user_id == user_id)
+        .order_by(ReportDigest.last_used_at.desc())
+        .limit(settings.REPORT_DEDUPE_MAX_PER_USER)
+    )
+    removed += (
+        db.query(ReportDigest)
+        .filter(ReportDigest.user_id == user_id, ReportDigest.id.not_in(keep.scalar_subquery()))
+        .delete(synchronize_session=False)
+    )
+    return removed
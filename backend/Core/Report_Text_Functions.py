@@ -0,0 +1,30 @@
+import zlib
+from uuid import UUID
+
+from ..Models.Medical_Data import ReportText
+
+TEXT_ENCODING = "zlib"
+
+
+def compress_report_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_report_text(content: bytes, encoding: str = TEXT_ENCODING) -> str:
+    if encoding != TEXT_ENCODING:
+        raise ValueError(f"Unsupported report text encoding: {encoding}")
+    return zlib.decompress(content).decode("utf-8")
+
+
+def report_text_row(report_id: UUID, text: str) -> dict:
+    """Column values for a health_report_texts row, usable with ORM objects or bulk inserts."""
+    return {
+        "report_id": report_id,
+        "encoding": TEXT_ENCODING,
+        "content": compress_report_text(text),
+        "text_length": len(text),
+    }
+
+
+def build_report_text(report_id: UUID, text: str) -> ReportText:
+    return ReportText(**report_text_row(report_id, text))
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Drains the analysis job queue. Run one or more of these next to the API; each claims due jobs
+with SKIP LOCKED, so any number of workers can share the table.
+
+    python -m backend.Jobs.Analysis_Worker --concurrency 4
+"""
+import argparse
+import asyncio
+import signal
+import sys
+
+from ..Core.Analysis_Job_Functions import claim_analysis_jobs
+from ..DataBase.Database import SessionLocal
+from ..Security.Settings import settings
+from ..Services.Gemini.Analysis_Services import process_analysis_job
+from ..Services.Gemini.Client import close_genai_client, start_genai_client
+
+
+def _claim(limit: int):
+    with SessionLocal() as db:
+        return claim_analysis_jobs(db, limit)
+
+
+async def run(concurrency: int, poll_seconds: float) -> None:
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await start_genai_client()
+    running: set[asyncio.Task] = set()
+    try:
+        while not stopping.is_set():
+            free = concurrency - len(running)
+            claimed = await asyncio.to_thread(_claim, free) if free else []
+            for job in claimed:
+                running.add(asyncio.create_task(process_analysis_job(job)))
+            if claimed:
+                print(f"[AnalysisWorker] claimed={len(claimed)} running={len(running)}")
+
+            # Sleep until a slot frees up, a poll is due, or shutdown is requested.
+            waiters = set(running)
+            waiters.add(asyncio.create_task(stopping.wait()))
+            timeout = None if free == len(claimed) and running else poll_seconds
+            done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in waiters - running:
+                task.cancel()
+            for task in done & running:
+                if task.exception():
+                    print(f"[AnalysisWorker] Job crashed: {task.exception()}")
+            running -= done
+
+        if running:
+            print(f"[AnalysisWorker] Finishing {len(running)} in-flight jobs before exit")
+            await asyncio.gather(*running, return_exceptions=True)
+    finally:
+        await close_genai_client()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=settings.ANALYSIS_WORKER_CONCURRENCY)
+    parser.add_argument("--poll-seconds", type=float, default=settings.ANALYSIS_JOB_POLL_SECONDS)
+    args = parser.parse_args(argv)
+
+    asyncio.run(run(max(1, args.concurrency), max(0.1, args.poll_seconds)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Re-runs AI analysis for reports left in a failed (or pending) state, e.g. after a Gemini outage.
+Reports are walked in id order in keyset batches, and progress is recorded after each batch, so
+a stopped run picks up after the last recorded id. Each report is claimed through analysis_jobs
+and completed exactly as an analysis worker would, so a worker or a retry never analyses it at
+the same time. Only one run at a time across all processes: a run holds a Postgres advisory
+lock and records its progress in reanalysis_runs.
+
+    python -m backend.Jobs.Reanalyze_Reports --concurrency 4 --rpm 60
+    python -m backend.Jobs.Reanalyze_Reports --status failed --status pending --checkpoint reanalyze.ckpt
+
+The same routine backs POST /admin/reanalyze.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import Connection, func, select, text, update
+from sqlalchemy.orm import Session
+
+from ..Core.Analysis_Job_Functions import ClaimedJob, claim_report_analysis
+from ..DataBase.Database import SessionLocal, engine
+from ..Models.Medical_Data import AnalysisJob, HealthData, ReanalysisRun
+from ..Security.Settings import settings
+from ..Services.Gemini.Analysis_Services import process_analysis_job
+from ..Services.Gemini.Client import close_genai_client, start_genai_client
+
+
+class RequestBudget:
+    """Spaces Gemini calls evenly so at most `per_minute` start per minute. 0 disables the budget."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+@dataclass
+class ReanalysisProgress:
+    statuses: list[str]
+    scanned: int = 0
+    completed: int = 0
+    failed: int = 0
+    from_cache: int = 0
+    last_id: Optional[UUID] = None
+    running: bool = False
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def reports_per_minute(self) -> float:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.scanned * 60 / elapsed if elapsed > 0 else 0.0
+
+
+# ── run lock and progress row ─────────────────────────────────────────────────
+
+# Advisory lock key shared by every process that can start a run ("REAN").
+REANALYSIS_LOCK_KEY = 0x5245414E
+
+
+class ReanalysisInProgress(RuntimeError):
+    pass
+
+
+def _unlock(connection: Connection) -> None:
+    try:
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REANALYSIS_LOCK_KEY})
+        connection.commit()
+    except Exception:
+        # Never hand a connection that may still hold the lock back to the pool.
+        connection.invalidate()
+    finally:
+        connection.close()
+
+
+@dataclass
+class ReanalysisLease:
+    """
+    One run's claim: the advisory lock, held on a dedicated connection so it lasts across the
+    run's own commits and is dropped by Postgres if the process dies, plus its progress row.
+    """
+
+    run_id: UUID
+    connection: Connection
+
+    def release(self) -> None:
+        _unlock(self.connection)
+
+
+def begin_reanalysis(statuses: list[str], after: Optional[UUID]) -> ReanalysisLease:
+    """Takes the run lock and records a new run. Raises ReanalysisInProgress if another run holds it."""
+    connection = engine.connect()
+    try:
+        locked = connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": REANALYSIS_LOCK_KEY})
+        connection.commit()
+    except BaseException:
+        connection.close()
+        raise
+    if not locked:
+        connection.close()
+        raise ReanalysisInProgress("A re-analysis run is already in progress.")
+
+    try:
+        with SessionLocal() as db:
+            _mark_interrupted(db)
+            run = ReanalysisRun(statuses=statuses, last_id=after, status="running")
+            db.add(run)
+            db.commit()
+            return ReanalysisLease(run.id, connection)
+    except BaseException:
+        _unlock(connection)
+        raise
+
+
+def _mark_interrupted(db: Session) -> None:
+    # Only called while holding the lock, so any run still marked running has lost its process.
+    db.execute(
+        update(ReanalysisRun)
+        .where(ReanalysisRun.status == "running")
+        .values(status="interrupted", finished_at=func.now())
+    )
+
+
+def latest_reanalysis(db: Session) -> Optional[ReanalysisRun]:
+    """The most recent run. A run whose process died without finishing is reported as interrupted."""
+    run = db.query(ReanalysisRun).order_by(ReanalysisRun.started_at.desc()).first()
+    if run is not None and run.running:
+        # The lock is free only if the process that owned this run is gone.
+        if db.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": REANALYSIS_LOCK_KEY}):
+            _mark_interrupted(db)
+            db.commit()
+            db.refresh(run)
+    return run
+
+
+def _save_progress(db: Session, run_id: UUID, progress: "ReanalysisProgress", **values) -> None:
+    row = {
+        "scanned": progress.scanned,
+        "completed": progress.completed,
+        "failed": progress.failed,
+        "from_cache": progress.from_cache,
+        "last_id": progress.last_id,
+        "elapsed_seconds": time.time() - progress.started_at,
+    }
+    row.update(values)
+    db.execute(update(ReanalysisRun).where(ReanalysisRun.id == run_id).values(**row))
+
+
+# ── run ────────────────────────────────────────────────────────────────────────
+
+def _next_batch(statuses: list[str], after: Optional[UUID], size: int) -> list[UUID]:
+    # Reports with a live queue job belong to the analysis workers.
+    queued = select(AnalysisJob.report_id).where(AnalysisJob.status.in_(("queued", "running")))
+    query = select(HealthData.id).where(HealthData.analysis_status.in_(statuses), HealthData.id.not_in(queued))
+    if after is not None:
+        query = query.where(HealthData.id > after)
+    with SessionLocal() as db:
+        return list(db.scalars(query.order_by(HealthData.id).limit(size)))
+
+
+def _claim(report_id: UUID) -> Optional[ClaimedJob]:
+    with SessionLocal() as db:
+        claimed = claim_report_analysis(db, [report_id])
+        db.commit()
+    return claimed[0] if claimed else None
+
+
+def _record_batch(run_id: UUID, progress: "ReanalysisProgress", scanned: int, last_id: UUID) -> None:
+    with SessionLocal() as db:
+        _save_progress(db, run_id, progress, scanned=scanned, last_id=last_id)
+        db.commit()
+
+
+async def reanalyze(
+    progress: ReanalysisProgress,
+    concurrency: int,
+    requests_per_minute: int,
+    batch_size: int,
+    on_batch: Optional[Callable[[ReanalysisProgress], None]] = None,
+    lease: Optional[ReanalysisLease] = None,
+) -> ReanalysisProgress:
+    """
+    Runs until no matching reports remain. Each report is claimed just before it is analysed
+    and committed on its own session; a failed attempt goes back on the queue with backoff,
+    like any other job. With a `lease`, progress is written to its run row after each batch,
+    and the lease is released when the run ends.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    budget = RequestBudget(requests_per_minute)
+    progress.running = True
+
+    async def analyse(report_id: UUID) -> Optional[bool]:
+        """True if analysed, False if it failed, None if it was claimed elsewhere first."""
+        async with slots:
+            job = await asyncio.to_thread(_claim, report_id)
+            if job is None:
+                return None
+            try:
+                outcome = await process_analysis_job(job, before_call=budget.acquire)
+            except Exception as e:
+                print(f"[Reanalyze] Failed for report {report_id}: {e}")
+                return False
+            if outcome is None:
+                return False
+            progress.from_cache += outcome.from_cache
+            return True
+
+    try:
+        while True:
+            report_ids = await asyncio.to_thread(_next_batch, progress.statuses, progress.last_id, batch_size)
+            if not report_ids:
+                break
+
+            for analysed in await asyncio.gather(*(analyse(report_id) for report_id in report_ids)):
+                if analysed:
+                    progress.completed += 1
+                elif analysed is False:
+                    progress.failed += 1
+            if lease:
+                await asyncio.to_thread(
+                    _record_batch, lease.run_id, progress, progress.scanned + len(report_ids), report_ids[-1]
+                )
+
+            progress.scanned += len(report_ids)
+            progress.last_id = report_ids[-1]
+            if on_batch:
+                on_batch(progress)
+            print(
+                f"[Reanalyze] scanned={progress.scanned} completed={progress.completed} "
+                f"failed={progress.failed} cached={progress.from_cache} "
+                f"per_min={progress.reports_per_minute:.1f} last_id={progress.last_id}"
+            )
+    except BaseException as e:
+        progress.error = str(e) or type(e).__name__
+        raise
+    finally:
+        progress.running = False
+        progress.finished_at = time.time()
+        if lease:
+            await asyncio.to_thread(_finish_run, lease, progress)
+
+    return progress
+
+
+def _finish_run(lease: ReanalysisLease, progress: ReanalysisProgress) -> None:
+    try:
+        with SessionLocal() as db:
+            _save_progress(
+                db,
+                lease.run_id,
+                progress,
+                status="failed" if progress.error else "finished",
+                error=progress.error,
+                finished_at=func.now(),
+            )
+            db.commit()
+    except Exception as e:
+        print(f"[Reanalyze] Could not record the end of run {lease.run_id}: {e}")
+    finally:
+        lease.release()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="append", choices=["failed", "pending"], dest="statuses")
+    parser.add_argument("--concurrency", type=int, default=settings.REANALYSIS_CONCURRENCY)
+    parser.add_argument("--rpm", type=int, default=settings.REANALYSIS_REQUESTS_PER_MINUTE,
+                        help="max Gemini calls per minute (0 = unlimited)")
+    parser.add_argument("--batch-size", type=int, default=settings.REANALYSIS_BATCH_SIZE)
+    parser.add_argument("--after", type=UUID, default=None, help="resume after this report id")
+    parser.add_argument("--checkpoint", type=Path, default=None,
+                        help="file holding the last committed id; read on start, updated per batch")
+    args = parser.parse_args(argv)
+
+    progress = ReanalysisProgress(statuses=args.statuses or ["failed"], last_id=args.after)
+    if args.checkpoint and args.checkpoint.exists() and progress.last_id is None:
+        progress.last_id = UUID(args.checkpoint.read_text().strip())
+        print(f"[Reanalyze] Resuming after {progress.last_id}")
+
+    def save_checkpoint(current: ReanalysisProgress) -> None:
+        if args.checkpoint:
+            args.checkpoint.write_text(f"{current.last_id}\n")
+
+    try:
+        lease = begin_reanalysis(progress.statuses, progress.last_id)
+    except ReanalysisInProgress as e:
+        print(f"[Reanalyze] {e}")
+        return 1
+
+    async def run() -> None:
+        await start_genai_client()
+        try:
+            await reanalyze(
+                progress, max(1, args.concurrency), max(0, args.rpm), max(1, args.batch_size), save_checkpoint, lease
+            )
+        finally:
+            await close_genai_client()
+
+    asyncio.run(run())
+    print(
+        f"[Reanalyze] done: scanned={progress.scanned} completed={progress.completed} "
+        f"failed={progress.failed} cached={progress.from_cache}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
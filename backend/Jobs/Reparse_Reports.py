@@ -0,0 +1,136 @@
+"""
+Re-runs the current biomarker parser over stored report text and bulk-updates only the
+columns whose values changed. Use it to backfill old reports after improving a pattern.
+
+    python -m backend.Jobs.Reparse_Reports --workers 4 --chunk-size 500
+    python -m backend.Jobs.Reparse_Reports --dry-run
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..Core.Clinical_Snapshot_Functions import refresh_clinical_snapshots
+from ..Core.Report_Text_Functions import decompress_report_text
+from ..DataBase.Database import SessionLocal
+from ..Models.Medical_Data import HealthData, ReportText
+from ..Schemas.Medical_Data_Schema import HealthDataCreate
+from ..Services.Biomarker_Scanner import FIELD_NAMES, scan_biomarkers
+
+
+def _reparse_chunk(items: list[tuple[UUID, str, bytes]]) -> list[tuple[UUID, dict | None]]:
+    # Runs in a worker process; returns None for rows whose new values fail validation.
+    parsed = []
+    for report_id, encoding, content in items:
+        fields = scan_biomarkers(decompress_report_text(content, encoding))
+        try:
+            HealthDataCreate(**fields)
+        except ValueError:
+            parsed.append((report_id, None))
+            continue
+        parsed.append((report_id, fields))
+    return parsed
+
+
+def _apply(db: Session, parsed: list[tuple[UUID, dict | None]], dry_run: bool) -> tuple[int, int]:
+    ids = [report_id for report_id, _ in parsed]
+    columns = [getattr(HealthData, name) for name in FIELD_NAMES]
+    current = {
+        row.id: row
+        for row in db.execute(select(HealthData.id, *columns).where(HealthData.id.in_(ids)))
+    }
+
+    changes = []
+    invalid = 0
+    for report_id, fields in parsed:
+        if fields is None:
+            invalid += 1
+            continue
+        row = current.get(report_id)
+        if row is None:
+            continue
+        changed = {name: value for name, value in fields.items() if getattr(row, name) != value}
+        if changed:
+            changes.append({"id": report_id, **changed})
+
+    if changes and not dry_run:
+        db.execute(update(HealthData), changes)
+        db.commit()
+        owners = db.scalars(
+            select(HealthData.user_id).where(HealthData.id.in_([change["id"] for change in changes])).distinct()
+        )
+        refresh_clinical_snapshots(db, list(owners))
+    return len(changes), invalid
+
+
+def run(workers: int, chunk_size: int, dry_run: bool) -> dict:
+    started = time.perf_counter()
+    totals = {"scanned": 0, "updated": 0, "invalid": 0}
+    last_id: UUID | None = None
+    exhausted = False
+    in_flight: set[Future] = set()
+
+    with SessionLocal() as db, ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        while not exhausted or in_flight:
+            # Keep two chunks per worker queued so workers never wait on the database.
+            while not exhausted and len(in_flight) < workers * 2:
+                query = (
+                    select(ReportText.report_id, ReportText.encoding, ReportText.content)
+                    .order_by(ReportText.report_id)
+                    .limit(chunk_size)
+                )
+                if last_id is not None:
+                    query = query.where(ReportText.report_id > last_id)
+                items = [tuple(row) for row in db.execute(query)]
+                if not items:
+                    exhausted = True
+                    break
+                last_id = items[-1][0]
+                in_flight.add(executor.submit(_reparse_chunk, items))
+
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for job in done:
+                parsed = job.result()
+                updated, invalid = _apply(db, parsed, dry_run)
+                totals["scanned"] += len(parsed)
+                totals["updated"] += updated
+                totals["invalid"] += invalid
+
+            elapsed = time.perf_counter() - started
+            print(
+                f"[Reparse] scanned={totals['scanned']} updated={totals['updated']} "
+                f"invalid={totals['invalid']} rows_per_sec={totals['scanned'] / elapsed:.0f}"
+            )
+
+    totals["seconds"] = time.perf_counter() - started
+    return totals
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=max(1, (multiprocessing.cpu_count() or 2) - 1))
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing them")
+    args = parser.parse_args(argv)
+
+    totals = run(max(1, args.workers), max(1, args.chunk_size), args.dry_run)
+    rate = totals["scanned"] / totals["seconds"] if totals["seconds"] else 0.0
+    print(
+        f"[Reparse] done: scanned={totals['scanned']} updated={totals['updated']} "
+        f"invalid={totals['invalid']} in {totals['seconds']:.1f}s ({rate:.0f} rows/sec)"
+        + (" [dry run]" if args.dry_run else "")
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
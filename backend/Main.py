@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -8,12 +10,32 @@ from .Router.Medical_Data_Router import router as medical_router
 from .Router.Medicine_Data_Router import router as medicine_router
 from .Router.System_Data_Router import router as system_router
 from .Router.Messaging_Router import router as messaging_router
+from .Router.Admin_Router import router as admin_router
 from .Security.Settings import settings
+from .Services.Connection_Manager import manager
+from .Services.Gemini.Client import close_genai_client, start_genai_client
+from .Services.Message_Writer import message_writer
+from .Services.Metrics import metrics
+from .Services.PDF_Executor import extraction_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_genai_client()
+    await manager.start()
+    await message_writer.start()
+    yield
+    await message_writer.close()
+    await manager.close()
+    await close_genai_client()
+    extraction_pool.shutdown()
+
 
 app = FastAPI(
     title="MedBrief AI",
     version="1.0.0",
-    description="Backend API for MedBrief AI"
+    description="Backend API for MedBrief AI",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,6 +53,7 @@ app.include_router(medical_router)
 app.include_router(medicine_router)
 app.include_router(system_router)
 app.include_router(messaging_router)
+app.include_router(admin_router)
 
 Base.metadata.create_all(bind=engine)
 
@@ -40,6 +63,11 @@ async def root():
     return {"message": "MedBrief AI backend is running"}
 
 
+@app.get("/metrics", tags=["Root"])
+async def read_metrics():
+    return metrics.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
 
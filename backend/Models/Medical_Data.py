@@ -1,11 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Float, func
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Float, Index, JSON, LargeBinary, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from ..DataBase import Base
 
 class HealthData(Base):
     __tablename__ = 'health_reports'
+    __table_args__ = (
+        Index("ix_health_reports_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("auth_users.id"))
@@ -35,6 +38,7 @@ class HealthData(Base):
     spo2 = Column(Float)
 
     analysis = relationship("MedicalAnalysis", back_populates="report", uselist=False)
+    raw_text = relationship("ReportText", back_populates="report", uselist=False, cascade="all, delete-orphan")
 
 
 class MedicalAnalysis(Base):
@@ -50,4 +54,102 @@ class MedicalAnalysis(Base):
     
     created_at = Column(DateTime, default=func.now())
 
-    report = relationship("HealthData", back_populates="analysis")
\ No newline at end of file
+    report = relationship("HealthData", back_populates="analysis")
+
+
+class ReportDigest(Base):
+    __tablename__ = "report_digests"
+    __table_args__ = (
+        UniqueConstraint("user_id", "content_sha256", name="uq_report_digest_user_sha"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("auth_users.id"), nullable=False, index=True)
+    content_sha256 = Column(String(64), nullable=False)
+    report_id = Column(UUID(as_uuid=True), ForeignKey("health_reports.id", ondelete="CASCADE"), nullable=False)
+
+    created_at = Column(DateTime, default=func.now())
+    last_used_at = Column(DateTime, default=func.now(), index=True)
+
+    report = relationship("HealthData")
+
+
+class ReportText(Base):
+    __tablename__ = "health_report_texts"
+
+    report_id = Column(UUID(as_uuid=True), ForeignKey("health_reports.id", ondelete="CASCADE"), primary_key=True)
+    encoding = Column(String, nullable=False, default="zlib")
+    content = Column(LargeBinary, nullable=False)
+    text_length = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+
+    report = relationship("HealthData", back_populates="raw_text")
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    report_id = Column(UUID(as_uuid=True), ForeignKey("health_reports.id", ondelete="CASCADE"), nullable=False, unique=True)
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+
+    run_after = Column(DateTime, nullable=False, default=func.now())
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+
+    report = relationship("HealthData")
+
+
+class ReanalysisRun(Base):
+    """Progress of one bulk re-analysis run, shared by every process; counters are committed per batch."""
+    __tablename__ = "reanalysis_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    statuses = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="running")  # running | finished | failed | interrupted
+    scanned = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    from_cache = Column(Integer, nullable=False, default=0)
+    last_id = Column(UUID(as_uuid=True), nullable=True)
+    error = Column(String, nullable=True)
+    elapsed_seconds = Column(Float, nullable=False, default=0.0)
+
+    started_at = Column(DateTime, default=func.now(), index=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    @property
+    def reports_per_minute(self) -> float:
+        return self.scanned * 60 / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+
+    key = Column(String(64), primary_key=True)
+    prompt_version = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=func.now(), index=True)
+
+
+class ClinicalSnapshot(Base):
+    """Latest report values and analysis per user, kept current so chat needs one keyed lookup."""
+    __tablename__ = "clinical_snapshots"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("auth_users.id", ondelete="CASCADE"), primary_key=True)
+    report_id = Column(UUID(as_uuid=True), ForeignKey("health_reports.id", ondelete="CASCADE"), nullable=False)
+    report_created_at = Column(DateTime, nullable=True)
+    analysis_status = Column(String, nullable=False)
+    biomarkers = Column(JSON, nullable=False)
+    analysis = Column(JSON, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
\ No newline at end of file
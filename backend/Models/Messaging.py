@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, UniqueConstraint, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Index, JSON, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from ..DataBase import Base
@@ -27,15 +27,39 @@ class Conversation(Base):
     )
 
 
+# Inbox keyset, one per side of the conversation; see Core/Messaging_Functions.list_inbox.
+_conversation_activity = func.coalesce(Conversation.last_message_at, Conversation.created_at)
+Index(
+    "ix_conversations_doctor_user_id_activity_id",
+    Conversation.doctor_user_id, _conversation_activity.desc(), Conversation.id.desc(),
+)
+Index(
+    "ix_conversations_patient_user_id_activity_id",
+    Conversation.patient_user_id, _conversation_activity.desc(), Conversation.id.desc(),
+)
+
+
 class DirectMessage(Base):
     __tablename__ = "direct_messages"
+    __table_args__ = (
+        Index("ix_direct_messages_conversation_id_created_at_id", "conversation_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False, index=True)
+    conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False)
     sender_id = Column(UUID(as_uuid=True), ForeignKey("auth_users.id"), nullable=False)
     content = Column(String, nullable=False)
     is_read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=func.now(), index=True)
 
     conversation = relationship("Conversation", back_populates="messages")
-    sender = relationship("Auth_User")
\ No newline at end of file
+    sender = relationship("Auth_User")
+
+
+class RealtimeEvent(Base):
+    """Socket events too large for a NOTIFY payload; the notification carries only the id."""
+    __tablename__ = "realtime_events"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=func.now(), index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Float, func
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Float, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship 
 from ..DataBase import Base
@@ -23,6 +23,9 @@ class Appointment(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_session_id_timestamp", "session_id", "timestamp"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("auth_users.id"), nullable=False)
@@ -31,11 +34,35 @@ class ChatMessage(Base):
     ai_response = Column(String, nullable=False)
     chat_mode = Column(String, nullable=False, default="gemini")
     timestamp = Column(DateTime, default=func.now())
-    session_id = Column(UUID(as_uuid=True), index=True)
+    session_id = Column(UUID(as_uuid=True))
 
     owner = relationship("Auth_User", back_populates="chat_history")
 
 
+class ChatSessionSummary(Base):
+    """Rolling summary of a chat session's older turns; everything up to the watermark is folded in."""
+    __tablename__ = "chat_session_summaries"
+
+    session_id = Column(UUID(as_uuid=True), primary_key=True)
+    summary = Column(String, nullable=False, default="")
+    summarized_through = Column(DateTime, nullable=True)
+    last_message_id = Column(UUID(as_uuid=True), nullable=True)
+    turns_summarized = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Held by the process folding this session while Gemini runs; expires if that process dies.
+    lease_token = Column(UUID(as_uuid=True), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+
+class RateLimitBucket(Base):
+    """Token bucket for the shared Postgres rate-limit store; times are database epoch seconds."""
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
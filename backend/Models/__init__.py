@@ -1,6 +1,6 @@
 from .Auth_Data import Auth_User
-from .Medical_Data import HealthData, MedicalAnalysis
+from .Medical_Data import AnalysisCacheEntry, AnalysisJob, ClinicalSnapshot, HealthData, MedicalAnalysis, ReanalysisRun, ReportDigest, ReportText
 from .Medicine_Data import Medicine, Prescription
 from .Personal_Data import Doctor, Profile
-from .System import Appointment, ChatMessage, AuditLog
-from .Messaging import Conversation, DirectMessage
\ No newline at end of file
+from .System import Appointment, ChatMessage, ChatSessionSummary, RateLimitBucket, AuditLog
+from .Messaging import Conversation, DirectMessage, RealtimeEvent
\ No newline at end of file
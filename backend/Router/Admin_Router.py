@@ -0,0 +1,59 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..DataBase.Database import get_db
+from ..Jobs.Reanalyze_Reports import (
+    ReanalysisInProgress,
+    ReanalysisProgress,
+    begin_reanalysis,
+    latest_reanalysis,
+    reanalyze,
+)
+from ..Schemas.Medical_Data_Schema import ReanalysisRequest, ReanalysisStatus
+from ..Security.Dependencies import require_admin_key
+from ..Security.Settings import settings
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin_key)])
+
+# Keeps each background run referenced until it ends; its state lives in reanalysis_runs.
+_reanalysis_tasks: set[asyncio.Task] = set()
+
+
+@router.post("/reanalyze", response_model=ReanalysisStatus, status_code=status.HTTP_202_ACCEPTED)
+async def start_reanalysis(payload: ReanalysisRequest, db: Session = Depends(get_db)):
+    """
+    Starts re-analysing failed (or pending) reports in the background. Pass `after` with the
+    `last_id` of an interrupted run to resume it. Only one run may be active across all workers.
+    """
+    statuses = list(dict.fromkeys(payload.statuses))
+    try:
+        lease = await asyncio.to_thread(begin_reanalysis, statuses, payload.after)
+    except ReanalysisInProgress as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    task = asyncio.create_task(reanalyze(
+        ReanalysisProgress(statuses=statuses, last_id=payload.after),
+        payload.concurrency or settings.REANALYSIS_CONCURRENCY,
+        payload.requests_per_minute if payload.requests_per_minute is not None else settings.REANALYSIS_REQUESTS_PER_MINUTE,
+        payload.batch_size or settings.REANALYSIS_BATCH_SIZE,
+        lease=lease,
+    ))
+    _reanalysis_tasks.add(task)
+    task.add_done_callback(_reanalysis_done)
+    return latest_reanalysis(db)
+
+
+@router.get("/reanalyze", response_model=ReanalysisStatus)
+async def get_reanalysis_status(db: Session = Depends(get_db)):
+    """Progress of the latest run, whichever worker is running it."""
+    run = latest_reanalysis(db)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No re-analysis run has been started.")
+    return run
+
+
+def _reanalysis_done(task: asyncio.Task) -> None:
+    _reanalysis_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        print(f"[Reanalyze] Run stopped: {task.exception()}")
@@ -1,15 +1,32 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+import anyio
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pathlib import Path
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from uuid import UUID, uuid4
 
-from ..DataBase.Database import get_db
-from ..Models.Medical_Data import HealthData
+from ..Core.Analysis_Job_Functions import enqueue_analysis_jobs
+from ..Core.Clinical_Snapshot_Functions import refresh_clinical_snapshot
+from ..Core.Report_Cache_Functions import find_cached_report, remember_report, remember_reports
+from ..DataBase.Database import get_db, SessionLocal
+from ..Core.Report_Text_Functions import build_report_text, report_text_row
+from ..Models.Medical_Data import HealthData, ReportText
 from ..Models.Personal_Data import Doctor, Profile
 from ..Schemas.Medical_Data_Schema import HealthDataCreate, HealthDataRead
-from ..Services.PDF_Extractor import extract_text_from_pdf, parse_health_fields
+from ..Services.PDF_Executor import (
+    ExtractionQueueFull,
+    ExtractionResult,
+    ExtractionTimeout,
+    ExtractionUnavailable,
+    extraction_pool,
+)
+from ..Services.Rate_Limiter import UPLOAD_POLICY, rate_limit
+from ..Services.Upload_Ingest import SpooledUpload, UploadPart, UploadRejected, UploadTooLarge, spool_multipart
 from ..Security.Dependencies import get_current_user
-from ..Services.Gemini.Analysis_Services import Analysis_And_Save
+from ..Security.Settings import settings
 
 UPLOAD_ROOT = Path(__file__).resolve().parents[1] / "uploads" / "reports"
 UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
@@ -17,6 +34,27 @@ UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
 router = APIRouter(prefix="/reports", tags=["Health Reports"])
 
 MAX_PDF_SIZE_MB = 10
+MAX_PDF_BYTES = MAX_PDF_SIZE_MB * 1024 * 1024
+PDF_CONTENT_TYPES = frozenset({"application/pdf"})
+
+
+def _pdf_upload_body(field: str, many: bool) -> dict:
+    """OpenAPI request body for routes that stream their multipart upload themselves."""
+    file_schema = {"type": "string", "format": "binary"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": [field],
+                        "properties": {field: {"type": "array", "items": file_schema} if many else file_schema},
+                    }
+                }
+            },
+        }
+    }
 
 
 # ── helpers ────────────────────────────────────────────────────────────────────
@@ -47,50 +85,115 @@ def _verify_doctor_owns_patient(db: Session, doctor_user_id: UUID, report_user_i
         )
 
 
-# ── routes ─────────────────────────────────────────────────────────────────────
-
-@router.post("/upload", response_model=HealthDataRead, status_code=status.HTTP_201_CREATED)
-async def upload_health_reports(
-    file: UploadFile = File(...),
-    patient_id: UUID | None = None,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-):
-    if file.content_type != "application/pdf":
+async def _extract_pdf(pdf_path: Path) -> ExtractionResult:
+    """Runs extraction on the shared process pool and maps pool errors to HTTP errors."""
+    try:
+        return await extraction_pool.extract(pdf_path)
+    except ExtractionQueueFull:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF files are accepted."
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Report processing is busy. Please try again shortly.",
+            headers={"Retry-After": "5"},
+        )
+    except ExtractionTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Timed out while reading this PDF."
+        )
+    except ExtractionUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Report processing is temporarily unavailable. Please try again shortly.",
+            headers={"Retry-After": "5"},
         )
 
-    pdf_bytes = await file.read()
 
-    if len(pdf_bytes) > MAX_PDF_SIZE_MB * 1024 * 1024:
+async def _spool_pdfs(request: Request, max_files: int) -> list[UploadPart]:
+    """Streams the request's PDF parts to UPLOAD_ROOT, mapping rejected bodies to HTTP 400."""
+    try:
+        return await spool_multipart(request, UPLOAD_ROOT, MAX_PDF_BYTES, PDF_CONTENT_TYPES, max_files)
+    except UploadTooLarge:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Max size is {MAX_PDF_SIZE_MB}MB."
         )
+    except UploadRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
+
+def _part_error(part: UploadPart) -> str | None:
+    if part.too_large:
+        return f"File too large. Max size is {MAX_PDF_SIZE_MB}MB."
+    if part.upload is None:
+        return "Only PDF files are accepted."
+    return None
+
+
+# ── routes ─────────────────────────────────────────────────────────────────────
+
+@router.post(
+    "/upload",
+    response_model=HealthDataRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(rate_limit(UPLOAD_POLICY))],
+    openapi_extra=_pdf_upload_body("file", many=False),
+)
+async def upload_health_reports(
+    request: Request,
+    patient_id: UUID | None = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Stores the extracted report and queues it for analysis. Returns with
+    analysis_status="pending"; the owner's sockets get an "analysis_status" event when it finishes.
+    The PDF (form field `file`) is streamed from the request straight to a temp file.
+    """
     if current_user.role == "doctor" and not patient_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="patient_id is required for doctor uploads."
         )
 
-    pdf_filename = f"{uuid4()}.pdf"
-    saved_pdf_path = UPLOAD_ROOT / pdf_filename
+    target_user_id = (
+        patient_id
+        if current_user.role == "doctor"
+        else current_user.id
+    )
+
+    parts = await _spool_pdfs(request, max_files=1)
+    part = next((p for p in parts if p.field == "file"), None)
+    error = _part_error(part) if part else "A PDF file is required in the 'file' field."
+    if error:
+        for p in parts:
+            if p.upload:
+                p.upload.discard()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error
+        )
+    upload = part.upload
 
     try:
-        saved_pdf_path.write_bytes(pdf_bytes)
+        cached = find_cached_report(db, target_user_id, upload.sha256)
+        if cached:
+            if current_user.role == "doctor":
+                _verify_doctor_owns_patient(db, current_user.id, cached.user_id)
+            print(f"[Upload] Duplicate of report {cached.id}, skipping extraction and analysis")
+            return cached
 
-        text = extract_text_from_pdf(pdf_bytes)
+        extraction = await _extract_pdf(upload.path)
 
-        if not text.strip():
+        if not extraction.text.strip():
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Could not extract any text from this PDF."
             )
 
-        raw_fields = parse_health_fields(text)
+        raw_fields = extraction.fields
 
         try:
             health_input = HealthDataCreate(**raw_fields)
@@ -100,12 +203,6 @@ async def upload_health_reports(
                 detail=f"Extracted data failed validation: {str(e)}"
             )
 
-        target_user_id = (
-            patient_id
-            if current_user.role == "doctor"
-            else current_user.id
-        )
-
         report = HealthData(
             user_id=target_user_id,
             uploaded_by=current_user.id,
@@ -114,30 +211,187 @@ async def upload_health_reports(
         )
 
         db.add(report)
+        db.flush()
+        db.add(build_report_text(report.id, extraction.text))
+        enqueue_analysis_jobs(db, [report.id])
         db.commit()
         db.refresh(report)
 
-        report_schema = HealthDataRead.model_validate(report)
-
-        try:
-            await Analysis_And_Save(report_schema, db)
-            report.analysis_status = "completed"
-        except Exception as e:
-            print(f"[Analysis] Failed for report {report.id}: {e}")
-            report.analysis_status = "failed"
-
-        db.commit()
-        db.refresh(report)
+        remember_report(db, target_user_id, upload.sha256, report.id)
+        refresh_clinical_snapshot(db, target_user_id)
         return report
 
     finally:
-        try:
-            saved_pdf_path.unlink(missing_ok=True)
-        except Exception:
-            pass
+        upload.discard()
 
 
-@router.post("/{report_id}/retry-analysis", response_model=HealthDataRead)
+@router.post(
+    "/upload-batch",
+    dependencies=[Depends(rate_limit(UPLOAD_POLICY))],
+    openapi_extra=_pdf_upload_body("files", many=True),
+)
+async def upload_health_reports_batch(
+    request: Request,
+    patient_id: UUID | None = None,
+    current_user=Depends(get_current_user),
+):
+    """
+    Accepts many PDFs at once (form field `files`) and streams one NDJSON line per file as its
+    extraction finishes, followed by a summary line once every new report (and its raw text)
+    has been bulk-inserted. Analysis for the new reports is queued for the analysis workers.
+    """
+    if current_user.role == "doctor" and not patient_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="patient_id is required for doctor uploads."
+        )
+
+    target_user_id = (
+        patient_id
+        if current_user.role == "doctor"
+        else current_user.id
+    )
+    uploader_id = current_user.id
+    is_doctor = current_user.role == "doctor"
+
+    # Upload bodies must be spooled before the response starts streaming.
+    parts = await _spool_pdfs(request, max_files=settings.BATCH_UPLOAD_MAX_FILES)
+    if not parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one PDF file is required in the 'files' field."
+        )
+    spooled: list[tuple[str, SpooledUpload | None, str | None]] = [
+        (part.filename, part.upload, _part_error(part)) for part in parts
+    ]
+
+    async def run_batch():
+        db = SessionLocal()
+        slots = asyncio.Semaphore(extraction_pool.workers)
+        rows: list[dict] = []
+        text_rows: list[dict] = []
+        digests: list[tuple[str, UUID]] = []
+        seen: dict[str, UUID | None] = {}
+        counts = {"created": 0, "duplicate": 0, "failed": 0}
+
+        async def extract_one(filename: str, upload: SpooledUpload):
+            async with slots:
+                try:
+                    return filename, upload, await extraction_pool.extract(upload.path), None
+                except Exception as e:
+                    return filename, upload, None, str(e) or type(e).__name__
+
+        def line(**item) -> str:
+            return json.dumps(item, default=str) + "\n"
+
+        jobs: list[asyncio.Task] = []
+        try:
+            for filename, upload, error in spooled:
+                if error:
+                    counts["failed"] += 1
+                    yield line(type="file", filename=filename, status="failed", detail=error)
+                    continue
+
+                if upload.sha256 in seen:
+                    counts["duplicate"] += 1
+                    yield line(
+                        type="file",
+                        filename=filename,
+                        status="duplicate",
+                        report_id=seen[upload.sha256],
+                        detail="Same file as an earlier one in this batch.",
+                    )
+                    continue
+
+                report = find_cached_report(db, target_user_id, upload.sha256)
+                if report:
+                    if is_doctor:
+                        try:
+                            _verify_doctor_owns_patient(db, uploader_id, report.user_id)
+                        except HTTPException as e:
+                            counts["failed"] += 1
+                            yield line(type="file", filename=filename, status="failed", detail=e.detail)
+                            continue
+                    seen[upload.sha256] = report.id
+                    counts["duplicate"] += 1
+                    yield line(type="file", filename=filename, status="duplicate", report_id=report.id)
+                    continue
+
+                seen[upload.sha256] = None
+                jobs.append(asyncio.create_task(extract_one(filename, upload)))
+
+            for finished in asyncio.as_completed(jobs):
+                filename, upload, extraction, error = await finished
+                if error is None and not extraction.text.strip():
+                    error = "Could not extract any text from this PDF."
+                if error is None:
+                    try:
+                        health_input = HealthDataCreate(**extraction.fields)
+                    except Exception as e:
+                        error = f"Extracted data failed validation: {str(e)}"
+
+                if error:
+                    counts["failed"] += 1
+                    yield line(type="file", filename=filename, status="failed", detail=error)
+                    continue
+
+                report_id = uuid4()
+                rows.append({
+                    "id": report_id,
+                    "user_id": target_user_id,
+                    "uploaded_by": uploader_id,
+                    "analysis_status": "pending",
+                    **health_input.model_dump(),
+                })
+                text_rows.append(report_text_row(report_id, extraction.text))
+                digests.append((upload.sha256, report_id))
+                seen[upload.sha256] = report_id
+                yield line(
+                    type="file",
+                    filename=filename,
+                    status="extracted",
+                    report_id=report_id,
+                    pages_parsed=extraction.pages_parsed,
+                )
+
+            if rows:
+                try:
+                    db.execute(insert(HealthData), rows)
+                    db.execute(insert(ReportText), text_rows)
+                    enqueue_analysis_jobs(db, [row["id"] for row in rows])
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    print(f"[Upload] Batch insert failed: {e}")
+                    counts["failed"] += len(rows)
+                    rows = []
+
+            if rows:
+                counts["created"] = len(rows)
+                remember_reports(db, target_user_id, digests)
+                refresh_clinical_snapshot(db, target_user_id)
+
+            yield line(type="summary", report_ids=[row["id"] for row in rows], **counts)
+
+        finally:
+            # The client went away or the stream was closed early: stop extractions that have
+            # not finished, and wait for them before deleting the files they read.
+            for job in jobs:
+                if not job.done():
+                    job.cancel()
+            try:
+                with anyio.CancelScope(shield=True):
+                    await asyncio.gather(*jobs, return_exceptions=True)
+            finally:
+                db.close()
+                for _, upload, _ in spooled:
+                    if upload:
+                        upload.discard()
+
+    return StreamingResponse(run_batch(), media_type="application/x-ndjson")
+
+
+@router.post("/{report_id}/retry-analysis", response_model=HealthDataRead, status_code=status.HTTP_202_ACCEPTED)
 async def retry_analysis(
     report_id: UUID,
     db: Session = Depends(get_db),
@@ -157,22 +411,15 @@ async def retry_analysis(
     if report.analysis_status == "completed":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Analysis already completed.")
 
-    report_schema = HealthDataRead.model_validate(report)
+    if not enqueue_analysis_jobs(db, [report.id]):
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Analysis is already queued or running.")
 
-    try:
-        await Analysis_And_Save(report_schema, db)
-        report.analysis_status = "completed"
-        db.commit()
-        db.refresh(report)
-        return report
-    except Exception as e:
-        print(f"[Analysis] Retry failed for report {report_id}: {e}")
-        report.analysis_status = "failed"
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="AI analysis service unavailable. Try again later."
-        )
+    report.analysis_status = "pending"
+    # Commits the re-queued job and status together with the owner's snapshot.
+    refresh_clinical_snapshot(db, report.user_id)
+    db.refresh(report)
+    return report
 
 
 @router.get("/mydataall", response_model=list[HealthDataRead])
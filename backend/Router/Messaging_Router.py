@@ -1,25 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import func
+from datetime import datetime
 from uuid import UUID
-from typing import List
+from typing import List, Optional
+
+from ..Core.Messaging_Functions import list_inbox, list_messages
 
 from ..DataBase.Database import get_db
 from ..Models.Auth_Data import Auth_User
 from ..Models.Messaging import Conversation, DirectMessage
 from ..Security.Dependencies import get_current_user, get_user_from_token_ws
 from ..Services.Connection_Manager import manager
+from ..Services.Message_Writer import message_event, message_writer
 from ..Schemas.Message_Schema import (
     StartConversationRequest,
     ConversationRead,
     ConversationSummary,
-    ConversationParticipant,
     DirectMessageCreate,
     DirectMessageRead,
 )
 
 router = APIRouter(prefix="/messaging", tags=["Messaging"])
 
+SOCKET_MAX_IN_FLIGHT = 32
+
 
 # ── helpers ──────────────────────────────────────────────────────────────────
 
@@ -83,55 +89,16 @@ def start_conversation(
 
 @router.get("/conversations", response_model=List[ConversationSummary])
 def list_conversations(
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[datetime] = Query(None, description="last_message_at of the previous page's final entry"),
+    before_id: Optional[UUID] = Query(None, description="id of the previous page's final entry"),
     current_user: Auth_User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    conversations = (
-        db.query(Conversation)
-        .filter(
-            or_(
-                Conversation.doctor_user_id == current_user.id,
-                Conversation.patient_user_id == current_user.id,
-            )
-        )
-        .order_by(Conversation.last_message_at.desc())
-        .all()
-    )
-
-    summaries: list[ConversationSummary] = []
-    for convo in conversations:
-        other_id = _other_user_id(convo, current_user.id)
-        other_user = db.query(Auth_User).filter(Auth_User.id == other_id).first()
-
-        last_message = (
-            db.query(DirectMessage)
-            .filter(DirectMessage.conversation_id == convo.id)
-            .order_by(DirectMessage.created_at.desc())
-            .first()
-        )
-        unread_count = (
-            db.query(DirectMessage)
-            .filter(
-                DirectMessage.conversation_id == convo.id,
-                DirectMessage.sender_id != current_user.id,
-                DirectMessage.is_read == False,
-            )
-            .count()
-        )
-
-        summaries.append(
-            ConversationSummary(
-                id=convo.id,
-                doctor_user_id=convo.doctor_user_id,
-                patient_user_id=convo.patient_user_id,
-                created_at=convo.created_at,
-                last_message_at=convo.last_message_at,
-                other_user=ConversationParticipant.model_validate(other_user),
-                last_message_preview=(last_message.content[:120] if last_message else None),
-                unread_count=unread_count,
-            )
-        )
-    return summaries
+    if (before is None) != (before_id is None):
+        # A timestamp alone cannot tell apart conversations that share it.
+        raise HTTPException(status_code=422, detail="Pass before and before_id together.")
+    return list_inbox(db, current_user.id, limit, before, before_id)
 
 
 # ── REST: messages within a conversation ────────────────────────────────────
@@ -139,6 +106,9 @@ def list_conversations(
 @router.get("/conversations/{conversation_id}/messages", response_model=List[DirectMessageRead])
 def get_messages(
     conversation_id: UUID,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[UUID] = Query(None, description="id of a message; returns the messages just before it"),
+    after: Optional[UUID] = Query(None, description="id of a message; returns the messages just after it"),
     current_user: Auth_User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -146,13 +116,19 @@ def get_messages(
     if not convo:
         raise HTTPException(status_code=404, detail="Conversation not found.")
     _assert_participant(convo, current_user)
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both.")
 
-    return (
-        db.query(DirectMessage)
-        .filter(DirectMessage.conversation_id == conversation_id)
-        .order_by(DirectMessage.created_at.asc())
-        .all()
-    )
+    cursors = {}
+    for name, message_id in (("before", before), ("after", after)):
+        if message_id is None:
+            continue
+        message = db.get(DirectMessage, message_id)
+        if not message or message.conversation_id != conversation_id:
+            raise HTTPException(status_code=400, detail=f"Unknown {name} message.")
+        cursors[name] = message
+
+    return list_messages(db, conversation_id, limit, **cursors)
 
 
 @router.post("/conversations/{conversation_id}/messages", response_model=DirectMessageRead)
@@ -173,7 +149,7 @@ async def send_message(
         content=payload.content,
     )
     db.add(message)
-    convo.last_message_at = message.created_at
+    convo.last_message_at = func.now()
     db.commit()
     db.refresh(message)
 
@@ -228,8 +204,35 @@ async def chat_socket(websocket: WebSocket, conversation_id: UUID, token: str):
     finally:
         db.close()
 
+    other_id = _other_user_id(convo, user.id)
     await manager.connect(user.id, websocket)
 
+    # Messages are saved by the group-commit writer; several may be in flight per socket so a
+    # burst from one sender can share a commit. Acks follow the order messages were sent.
+    in_flight = asyncio.Semaphore(SOCKET_MAX_IN_FLIGHT)
+    saving: set[asyncio.Task] = set()
+
+    async def save_and_deliver(content: str) -> None:
+        # Other processes get the message from the writer's commit; this one delivers it here.
+        try:
+            message = await message_writer.write(conversation_id, user.id, content, recipient_id=other_id)
+        except Exception as e:
+            print(f"[Messaging] Could not save message in {conversation_id}: {e}")
+            payload = {"type": "error", "data": {"detail": "Message could not be saved."}}
+            other = None
+        else:
+            payload = message_event(message)
+            other = other_id
+        finally:
+            in_flight.release()
+
+        try:
+            await websocket.send_json(payload)
+        except Exception:
+            pass
+        if other is not None:
+            await manager.deliver_local(other, payload)
+
     try:
         while True:
             raw = await websocket.receive_json()
@@ -242,32 +245,13 @@ async def chat_socket(websocket: WebSocket, conversation_id: UUID, token: str):
                 await websocket.send_json({"type": "error", "data": {"detail": "Message too long."}})
                 continue
 
-            db = SessionLocal()
-            try:
-                message = DirectMessage(
-                    conversation_id=conversation_id,
-                    sender_id=user.id,
-                    content=content,
-                )
-                db.add(message)
-                convo = db.get(Conversation, conversation_id)
-                convo.last_message_at = message.created_at
-                db.commit()
-                db.refresh(message)
-
-                payload = {
-                    "type": "message",
-                    "data": DirectMessageRead.model_validate(message).model_dump(mode="json"),
-                }
-                other_id = _other_user_id(convo, user.id)
-            finally:
-                db.close()
-
-            await websocket.send_json(payload)
-            await manager.send_to_user(other_id, payload)
+            await in_flight.acquire()
+            task = asyncio.create_task(save_and_deliver(content))
+            saving.add(task)
+            task.add_done_callback(saving.discard)
 
     except WebSocketDisconnect:
         manager.disconnect(user.id, websocket)
     except Exception:
         manager.disconnect(user.id, websocket)
-        raise
\ No newline at end of file
+        raise
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID, uuid4
 from typing import List, Optional
-from collections import defaultdict
+import asyncio
+import json
 import time
 
-from ..DataBase.Database import get_db
-from ..Models.System import Appointment, ChatMessage
-from ..Models.Medical_Data import HealthData
+from ..Core.Clinical_Snapshot_Functions import get_clinical_snapshot
+from ..DataBase.Database import get_db, SessionLocal
+from ..Models.System import Appointment, ChatMessage, ChatSessionSummary
 from ..Security.Dependencies import get_current_user
 from ..Schemas.System_Schema import (
     AppointmentBase,
@@ -17,36 +19,17 @@ from ..Schemas.System_Schema import (
     ChatMessageRead,
     ChatSessionResponse,
 )
-from ..Services.Gemini.Client import call_genai
-from ..Services.Gemini.Prompts.Chat_Prompts import build_gemini_chat_prompt
+from ..Security.Settings import settings
+from ..Services.Gemini.Chat_Summaries import schedule_session_summary, unsummarized_turns
+from ..Services.Gemini.Client import call_genai, stream_genai
+from ..Services.Gemini.Resilience import GenAIUnavailable
+from ..Services.Gemini.Prompts.Chat_Prompts import build_gemini_chat_prompt, estimate_tokens
+from ..Services.Metrics import metrics
+from ..Services.Rate_Limiter import CHAT_POLICY, rate_limit
 
 router = APIRouter(prefix="/system", tags=["System"])
 
 
-# ── rate limiter ───────────────────────────────────────────────────────────────
-_request_log: dict[str, list[float]] = defaultdict(list)
-
-CHAT_RATE_LIMIT = 20
-CHAT_WINDOW_SECONDS = 60
-
-
-def _check_chat_rate_limit(user_id: UUID) -> None:
-    key = str(user_id)
-    now = time.time()
-    window_start = now - CHAT_WINDOW_SECONDS
-
-    _request_log[key] = [t for t in _request_log[key] if t > window_start]
-
-    if len(_request_log[key]) >= CHAT_RATE_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Rate limit exceeded. Max {CHAT_RATE_LIMIT} messages per minute.",
-            headers={"Retry-After": str(CHAT_WINDOW_SECONDS)},
-        )
-
-    _request_log[key].append(now)
-
-
 # ── appointments ───────────────────────────────────────────────────────────────
 
 @router.post("/appointments", response_model=AppointmentRead)
@@ -118,34 +101,34 @@ def delete_appointment(appointment_id: UUID, db: Session = Depends(get_db)):
 
 # ── chat ───────────────────────────────────────────────────────────────────────
 
-@router.post("/chat", response_model=ChatMessageRead)
-async def send_message(
-    payload: ChatMessageCreate,
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    _check_chat_rate_limit(current_user.id)
+EMPTY_CHAT_RESPONSE = "Gemini could not generate a response. Please try again."
 
-    user = current_user
+
+def _prepare_chat(db: Session, user, payload: ChatMessageCreate) -> tuple[UUID, str, str, bool]:
+    """
+    Returns (session_id, chat_mode, prompt, needs_summary) for a chat turn. `needs_summary` is
+    set once the session has enough unsummarized turns to fold the older ones into its summary.
+    """
     session_id = payload.session_id or uuid4()
     chat_mode = payload.chat_mode or "gemini"
     chat_mode = chat_mode if chat_mode in {"gemini", "doctor"} else "gemini"
 
-    reports = (
-        db.query(HealthData)
-        .filter(HealthData.user_id == user.id)
-        .order_by(HealthData.created_at.desc())
-        .all()
-    )
-    latest_report = reports[0] if reports else None
+    snapshot = get_clinical_snapshot(db, user.id)
+    latest_report = snapshot.biomarkers if snapshot else None
 
     session_history = []
+    summary = None
     if payload.session_id:
+        summary = db.get(ChatSessionSummary, session_id)
+        # Newest turns first via the (session_id, timestamp) index, then back to oldest first.
+        # Ties break on id, the same (timestamp, id) order as the summary watermark.
         session_history = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.session_id == session_id)
+            unsummarized_turns(db, session_id, summary)
+            .order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+            .limit(settings.CHAT_HISTORY_MAX_TURNS)
             .all()
         )
+        session_history.reverse()
 
     prompt = build_gemini_chat_prompt(
         user_name=user.username,
@@ -153,11 +136,40 @@ async def send_message(
         latest_report=latest_report,
         session_history=session_history,
         chat_mode=chat_mode,
+        token_budget=settings.CHAT_PROMPT_TOKEN_BUDGET,
+        session_summary=summary.summary if summary else None,
     )
+    metrics.observe_value("chat_prompt_tokens", estimate_tokens(prompt), chat_mode=chat_mode)
+    metrics.observe_value("chat_history_turns_loaded", len(session_history))
+
+    # The turn being answered now counts towards the threshold too.
+    needs_summary = len(session_history) + 1 > settings.CHAT_SUMMARY_TRIGGER_TURNS
+    return session_id, chat_mode, prompt, needs_summary
 
-    ai_response = await call_genai(prompt)
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/chat", response_model=ChatMessageRead, dependencies=[Depends(rate_limit(CHAT_POLICY))])
+async def send_message(
+    payload: ChatMessageCreate,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    user = current_user
+    session_id, chat_mode, prompt, needs_summary = _prepare_chat(db, user, payload)
+
+    try:
+        ai_response = await call_genai(prompt)
+    except GenAIUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service is temporarily unavailable. Try again shortly.",
+            headers={"Retry-After": str(int(settings.GEMINI_BREAKER_OPEN_SECONDS))},
+        )
     if not ai_response.strip():
-        ai_response = "Gemini could not generate a response. Please try again."
+        ai_response = EMPTY_CHAT_RESPONSE
 
     message = ChatMessage(
         user_id=user.id,
@@ -169,9 +181,79 @@ async def send_message(
     db.add(message)
     db.commit()
     db.refresh(message)
+
+    if needs_summary:
+        schedule_session_summary(session_id)
     return message
 
 
+@router.post("/chat/stream", dependencies=[Depends(rate_limit(CHAT_POLICY))])
+async def stream_message(
+    payload: ChatMessageCreate,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Same as POST /chat, but streams the reply as Server-Sent Events: `start` with the session id,
+    `token` events as text arrives, then `done` with the saved message (or `error`).
+    The message is saved only when the stream completes. If the client disconnects, the
+    Gemini stream is closed and nothing is saved.
+    """
+    user_id = current_user.id
+    session_id, chat_mode, prompt, needs_summary = _prepare_chat(db, current_user, payload)
+
+    async def events():
+        started = time.perf_counter()
+        parts: list[str] = []
+        yield _sse("start", {"session_id": session_id, "chat_mode": chat_mode})
+
+        tokens = stream_genai(prompt)
+        try:
+            async for text in tokens:
+                if not parts:
+                    metrics.observe("chat_stream_first_token_seconds", time.perf_counter() - started)
+                parts.append(text)
+                yield _sse("token", {"text": text})
+        except asyncio.CancelledError:
+            metrics.incr("chat_stream_cancelled")
+            raise
+        except RuntimeError as e:
+            print(f"[Chat] Stream failed for session {session_id}: {e}")
+            yield _sse("error", {"detail": "AI service unavailable. Try again later."})
+            return
+        finally:
+            await tokens.aclose()
+
+        ai_response = "".join(parts)
+        if not ai_response.strip():
+            ai_response = EMPTY_CHAT_RESPONSE
+
+        with SessionLocal() as session:
+            message = ChatMessage(
+                user_id=user_id,
+                user_query=payload.user_query,
+                ai_response=ai_response,
+                session_id=session_id,
+                chat_mode=chat_mode,
+            )
+            session.add(message)
+            session.commit()
+            session.refresh(message)
+            saved = ChatMessageRead.model_validate(message).model_dump(mode="json")
+
+        if needs_summary:
+            schedule_session_summary(session_id)
+
+        metrics.observe("chat_stream_seconds", time.perf_counter() - started)
+        yield _sse("done", saved)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/chat/session/{session_id}", response_model=ChatSessionResponse)
 def get_session(session_id: UUID, db: Session = Depends(get_db)):
     messages = (
@@ -52,4 +52,28 @@ class HealthDataRead(HealthDataBase):
     analysis_status: Literal["pending", "completed", "failed"] = "pending"   # ← add this
     analysis: Optional[MedicalAnalysisRead] = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReanalysisRequest(BaseModel):
+    statuses: list[Literal["failed", "pending"]] = ["failed"]
+    after: Optional[UUID] = Field(None, description="Resume after this report id")
+    concurrency: Optional[int] = Field(None, ge=1, le=32)
+    requests_per_minute: Optional[int] = Field(None, ge=0, description="0 = unlimited")
+    batch_size: Optional[int] = Field(None, ge=1, le=1000)
+
+
+class ReanalysisStatus(BaseModel):
+    id: UUID
+    status: str
+    statuses: list[str]
+    scanned: int
+    completed: int
+    failed: int
+    from_cache: int
+    last_id: Optional[UUID] = None
+    running: bool
+    error: Optional[str] = None
+    reports_per_minute: float
+
+    model_config = ConfigDict(from_attributes=True)
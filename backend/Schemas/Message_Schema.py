@@ -27,6 +27,7 @@ class ConversationRead(BaseModel):
 class ConversationSummary(ConversationRead):
     other_user: ConversationParticipant
     last_message_at: Optional[datetime] = None
+    last_message_preview: Optional[str] = None
     unread_count: int = 0
 
 
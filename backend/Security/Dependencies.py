@@ -1,5 +1,6 @@
+import hmac
 import uuid
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
@@ -7,6 +8,7 @@ from sqlalchemy.orm import Session
 from ..DataBase.Database import get_db, SessionLocal
 from ..Models.Auth_Data import Auth_User
 from .Security import ALGORITHM, SECRET_KEY
+from .Settings import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -64,4 +66,9 @@ async def get_current_user(
 
         return user
     except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+
+
+async def require_admin_key(x_admin_key: str | None = Header(None)) -> None:
+    if not settings.ADMIN_API_KEY or not x_admin_key or not hmac.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin key required.")
@@ -8,12 +8,87 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
     GEMINI_API_KEY: str
+    # "google" calls the Gemini API; "fake" answers locally for load tests and offline benchmarks.
+    GENAI_PROVIDER: str = "google"
     GEMINI_MODEL: str = "gemini-3.0-flash"
+    GEMINI_MAX_CONNECTIONS: int = 20
+    GEMINI_HTTP_TIMEOUT_SECONDS: float = 120.0
+    GEMINI_CALL_TIMEOUT_SECONDS: float = 30.0
+    GEMINI_DEADLINE_SECONDS: float = 60.0
+    GEMINI_MAX_RETRIES: int = 2
+    GEMINI_RETRY_BASE_SECONDS: float = 0.5
+    GEMINI_BREAKER_WINDOW: int = 20
+    GEMINI_BREAKER_MIN_CALLS: int = 10
+    GEMINI_BREAKER_ERROR_RATE: float = 0.5
+    GEMINI_BREAKER_OPEN_SECONDS: float = 30.0
+    GEMINI_HEDGE_ENABLED: bool = False
+    GEMINI_HEDGE_MIN_SAMPLES: int = 20
+    FAKE_GENAI_LATENCY_MS: float = 800.0
+    FAKE_GENAI_LATENCY_SIGMA: float = 0.35
+    FAKE_GENAI_ERROR_RATE: float = 0.0
+    FAKE_GENAI_STREAM_CHUNKS: int = 20
+
+    CHAT_PROMPT_TOKEN_BUDGET: int = 6000
+    CHAT_HISTORY_MAX_TURNS: int = 30
+    # Once a session has more unsummarized turns than this, older ones are folded into its summary.
+    CHAT_SUMMARY_TRIGGER_TURNS: int = 12
+    CHAT_SUMMARY_KEEP_RECENT_TURNS: int = 6
+    # How long a fold may hold a session's summary; keep it above GEMINI_DEADLINE_SECONDS.
+    CHAT_SUMMARY_LEASE_SECONDS: float = 120.0
+
+    CLINICAL_SNAPSHOT_CACHE_ENTRIES: int = 10000
+    CLINICAL_SNAPSHOT_CACHE_TTL_SECONDS: float = 60.0
+
+    # memory (per process) | postgres | redis (any Redis-protocol server with Lua scripting)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100000
+    RATE_LIMIT_CHAT_PER_MINUTE: int = 20
+    RATE_LIMIT_UPLOAD_PER_MINUTE: int = 30
+
+    # postgres (LISTEN/NOTIFY, needed with more than one app process) | local (single process)
+    REALTIME_BACKPLANE: str = "postgres"
+
+    # WebSocket messages arriving within this window are written in one transaction.
+    MESSAGE_WRITER_WINDOW_MS: float = 5.0
+    MESSAGE_WRITER_MAX_BATCH: int = 200
+
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     ALLOWED_HOSTS: str = "*"
 
+    PDF_EXTRACTION_WORKERS: int = 2
+    PDF_EXTRACTION_TIMEOUT_SECONDS: float = 60.0
+    PDF_EXTRACTION_MAX_QUEUE: int = 16
+    PDF_PAGE_BUDGET: int = 40
+    PDF_TEXT_BACKEND: str = "pypdfium2"
+    PDF_OCR_ENABLED: bool = True
+    PDF_OCR_DPI: int = 200
+    PDF_OCR_LANGUAGE: str = "eng"
+    PDF_OCR_TIMEOUT_SECONDS: float = 120.0
+
+    REPORT_DEDUPE_TTL_DAYS: int = 30
+    REPORT_DEDUPE_MAX_PER_USER: int = 200
+
+    BATCH_UPLOAD_MAX_FILES: int = 50
+
+    ANALYSIS_WORKER_CONCURRENCY: int = 4
+    ANALYSIS_JOB_MAX_ATTEMPTS: int = 5
+    ANALYSIS_JOB_BACKOFF_SECONDS: float = 15.0
+    ANALYSIS_JOB_POLL_SECONDS: float = 2.0
+    ANALYSIS_JOB_LEASE_SECONDS: int = 600
+
+    ANALYSIS_CACHE_TTL_DAYS: int = 30
+    ANALYSIS_CACHE_MEMORY_ENTRIES: int = 1024
+
+    REANALYSIS_CONCURRENCY: int = 4
+    REANALYSIS_REQUESTS_PER_MINUTE: int = 60
+    REANALYSIS_BATCH_SIZE: int = 100
+
+    # Required in the X-Admin-Key header for /admin routes; unset disables them.
+    ADMIN_API_KEY: str | None = None
+
     @property
     def allowed_hosts_list(self) -> list[str]:
         return [h.strip() for h in self.ALLOWED_HOSTS.split(",") if h.strip()]
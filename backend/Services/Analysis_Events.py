@@ -0,0 +1,15 @@
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from .Realtime_Backplane import notify_user
+
+
+def publish_analysis_status(db: Session, user_id: UUID, report_id: UUID, status: str) -> None:
+    """
+    Queues the status change for the report owner's sockets on the caller's transaction.
+    Postgres only delivers it on commit, so nobody hears about a status that was rolled back.
+    Every app process listening on the backplane forwards it to its own sockets.
+    """
+    payload = {"type": "analysis_status", "data": {"report_id": str(report_id), "status": status}}
+    notify_user(db, user_id, payload)
@@ -2,10 +2,27 @@ import uuid
 from collections import defaultdict
 from fastapi import WebSocket
 
+from ..Core.Clinical_Snapshot_Functions import snapshot_cache
+from ..Security.Settings import settings
+from .Metrics import metrics
+from .Realtime_Backplane import BACKPLANES, Backplane
+
 
 class ConnectionManager:
-    def __init__(self) -> None:
+    """
+    Sockets connected to this process. `send_to_user` delivers to them directly and publishes
+    the event on the backplane, so a recipient connected to another worker gets it as well.
+    """
+
+    def __init__(self, backplane: Backplane) -> None:
         self._connections: dict[uuid.UUID, set[WebSocket]] = defaultdict(set)
+        self.backplane = backplane
+
+    async def start(self) -> None:
+        await self.backplane.start(self._on_backplane_event)
+
+    async def close(self) -> None:
+        await self.backplane.close()
 
     async def connect(self, user_id: uuid.UUID, websocket: WebSocket) -> None:
         await websocket.accept()
@@ -20,9 +37,24 @@ class ConnectionManager:
             self._connections.pop(user_id, None)
 
     def is_online(self, user_id: uuid.UUID) -> bool:
+        """Only knows about sockets on this process."""
         return bool(self._connections.get(user_id))
 
     async def send_to_user(self, user_id: uuid.UUID, payload: dict) -> None:
+        await self.deliver_local(user_id, payload)
+        try:
+            await self.backplane.publish(user_id, payload)
+        except Exception as e:
+            metrics.incr("realtime_publish_errors", backplane=self.backplane.name)
+            print(f"[Backplane] Publish failed for user {user_id}: {e}")
+
+    async def _on_backplane_event(self, user_id: uuid.UUID, payload: dict) -> None:
+        if payload.get("type") == "analysis_status":
+            # Analyses finish in the worker processes; their commit rebuilt the owner's snapshot.
+            snapshot_cache.invalidate(user_id)
+        await self.deliver_local(user_id, payload)
+
+    async def deliver_local(self, user_id: uuid.UUID, payload: dict) -> None:
         for ws in list(self._connections.get(user_id, ())):
             try:
                 await ws.send_json(payload)
@@ -30,4 +62,6 @@ class ConnectionManager:
                 continue
 
 
-manager = ConnectionManager()
\ No newline at end of file
+if settings.REALTIME_BACKPLANE not in BACKPLANES:
+    raise ValueError(f"Unknown REALTIME_BACKPLANE {settings.REALTIME_BACKPLANE!r}; choose from {sorted(BACKPLANES)}")
+manager = ConnectionManager(BACKPLANES[settings.REALTIME_BACKPLANE]())
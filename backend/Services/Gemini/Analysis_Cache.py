@@ -0,0 +1,63 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from ...Schemas.Medical_Data_Schema import HealthDataBase
+from ...Security.Settings import settings
+
+
+def analysis_cache_key(data: HealthDataBase, prompt_version: str, model: str) -> str:
+    """
+    Hashes the biomarker values exactly as the prompt renders them, so two reports share a
+    key only when they would send Gemini the same prompt to the same model.
+    """
+    values = {}
+    for name in HealthDataBase.model_fields:
+        value = getattr(data, name)
+        values[name] = None if value is None else str(value).strip()
+    payload = json.dumps(
+        {"prompt_version": prompt_version, "model": model, "values": values},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisLRU:
+    """Per-process tier in front of the analysis_cache table."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+analysis_memory_cache = AnalysisLRU(
+    settings.ANALYSIS_CACHE_MEMORY_ENTRIES,
+    settings.ANALYSIS_CACHE_TTL_DAYS * 24 * 3600,
+)
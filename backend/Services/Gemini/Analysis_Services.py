@@ -1,11 +1,54 @@
 import json
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
 from sqlalchemy.orm import Session
-from ...Models.Medical_Data import MedicalAnalysis
-from ...Schemas.Medical_Data_Schema import HealthDataRead
-from .Client import call_genai
-from .Prompts.Medical_Data_Prompts import Medical_Analysis_Prompts
+from ...Core.Analysis_Cache_Functions import find_cached_analysis, store_cached_analysis
+from ...Core.Clinical_Snapshot_Functions import rebuild_clinical_snapshots, snapshot_cache
+from ...Core.Analysis_Job_Functions import ClaimedJob, fail_analysis_job, finish_analysis_job
+from ...DataBase.Database import SessionLocal
+from ...Models.Medical_Data import HealthData, MedicalAnalysis
+from ...Schemas.Medical_Data_Schema import HealthDataRead, MedicalAnalysisBase
+from ..Analysis_Events import publish_analysis_status
+from ..Metrics import metrics
+from .Analysis_Cache import analysis_cache_key, analysis_memory_cache
+from .Client import call_genai, genai_model_id
+from .Prompts.Medical_Data_Prompts import MEDICAL_ANALYSIS_PROMPT_VERSION, Medical_Analysis_Prompts
 
-async def Analysis_And_Save(data: HealthDataRead, db: Session) -> MedicalAnalysis:
+@dataclass
+class AnalysisOutcome:
+    key: str
+    model: str
+    result: dict
+    from_cache: bool
+
+
+async def fetch_analysis(
+    data: HealthDataRead,
+    db: Session,
+    before_call: Optional[Callable[[], Awaitable[None]]] = None,
+) -> AnalysisOutcome:
+    """
+    Checks the in-process LRU, then the analysis_cache table, then asks Gemini.
+    `before_call` is awaited only when a network call is actually needed (e.g. a rate budget).
+    """
+    model = genai_model_id()
+    key = analysis_cache_key(data, MEDICAL_ANALYSIS_PROMPT_VERSION, model)
+
+    result = analysis_memory_cache.get(key)
+    if result is not None:
+        metrics.incr("analysis_cache_hits", tier="memory")
+        return AnalysisOutcome(key, model, result, from_cache=True)
+
+    result = find_cached_analysis(db, key)
+    if result is not None:
+        metrics.incr("analysis_cache_hits", tier="database")
+        analysis_memory_cache.put(key, result)
+        return AnalysisOutcome(key, model, result, from_cache=True)
+
+    metrics.incr("analysis_cache_misses")
+    if before_call is not None:
+        await before_call()
     raw = await call_genai(Medical_Analysis_Prompts(data))
 
     clean = raw.replace("```json", "").replace("```", "").strip()
@@ -17,19 +60,82 @@ async def Analysis_And_Save(data: HealthDataRead, db: Session) -> MedicalAnalysi
     except (json.JSONDecodeError, ValueError) as e:
         raise RuntimeError(f"Gemini returned invalid response: {e} | Raw: {raw}")
 
+    result = {name: result.get(name) for name in MedicalAnalysisBase.model_fields}
+    analysis_memory_cache.put(key, result)
+    return AnalysisOutcome(key, model, result, from_cache=False)
+
+
+def add_analysis(db: Session, report_id: UUID, outcome: AnalysisOutcome) -> MedicalAnalysis:
+    """Adds the analysis row (and a cache entry for fresh results) without committing."""
+    analysis = MedicalAnalysis(
+        report_id=report_id,
+        cardiac_risk_score=outcome.result.get("cardiac_risk_score"),
+        metabolic_status=outcome.result.get("metabolic_status"),
+        kidney_status=outcome.result.get("kidney_status"),
+        ai_summary=outcome.result.get("ai_summary"),
+    )
+    db.add(analysis)
+    if not outcome.from_cache:
+        store_cached_analysis(db, outcome.key, MEDICAL_ANALYSIS_PROMPT_VERSION, outcome.model, outcome.result)
+    return analysis
+
+
+async def Analysis_And_Save(data: HealthDataRead, db: Session) -> MedicalAnalysis:
+    outcome = await fetch_analysis(data, db)
+
     try:
-        analysis = MedicalAnalysis(
-            report_id=data.id,
-            cardiac_risk_score=result.get("cardiac_risk_score"),
-            metabolic_status=result.get("metabolic_status"),
-            kidney_status=result.get("kidney_status"),
-            ai_summary=result.get("ai_summary"),
-        )
-        db.add(analysis)
+        analysis = add_analysis(db, data.id, outcome)
         db.commit()
         db.refresh(analysis)
     except Exception as e:
         db.rollback()
         raise RuntimeError(f"Failed to save analysis: {e}")
 
-    return analysis
\ No newline at end of file
+    return analysis
+
+
+async def process_analysis_job(
+    job: ClaimedJob,
+    before_call: Optional[Callable[[], Awaitable[None]]] = None,
+) -> Optional[AnalysisOutcome]:
+    """
+    Runs one claimed job on its own session. Failures are retried with backoff; the report is
+    only marked failed once the job runs out of attempts. The owner is notified on every final status.
+    Returns the outcome if this call saved an analysis, otherwise None.
+    """
+    db = SessionLocal()
+    try:
+        report = db.get(HealthData, job.report_id)
+        if not report or report.analysis_status == "completed":
+            finish_analysis_job(db, job.id)
+            db.commit()
+            return None
+
+        try:
+            outcome = await fetch_analysis(HealthDataRead.model_validate(report), db, before_call)
+            # The analysis, the report status, the job removal and the owner's snapshot commit
+            # together, so a crash can never leave a saved analysis behind a job that will run
+            # again, or behind a snapshot that does not show it.
+            add_analysis(db, report.id, outcome)
+            report.analysis_status = "completed"
+            finish_analysis_job(db, job.id)
+            rebuild_clinical_snapshots(db, [report.user_id])
+            publish_analysis_status(db, report.user_id, report.id, "completed")
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[Analysis] Attempt {job.attempts} failed for report {job.report_id}: {e}")
+            if fail_analysis_job(db, job, str(e)):
+                report.analysis_status = "failed"
+                rebuild_clinical_snapshots(db, [report.user_id])
+                publish_analysis_status(db, report.user_id, report.id, "failed")
+                db.commit()
+                snapshot_cache.invalidate(report.user_id)
+            else:
+                db.commit()
+            return None
+
+        snapshot_cache.invalidate(report.user_id)
+        return outcome
+    finally:
+        db.close()
@@ -0,0 +1,129 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import func, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Query, Session
+
+from ...DataBase.Database import SessionLocal
+from ...Models.System import ChatMessage, ChatSessionSummary
+from ...Security.Settings import settings
+from ..Metrics import metrics
+from .Client import call_genai
+from .Prompts.Chat_Prompts import build_session_summary_prompt
+
+_in_flight: set[UUID] = set()
+_tasks: set[asyncio.Task] = set()
+
+
+def unsummarized_turns(db: Session, session_id: UUID, summary: ChatSessionSummary | None) -> Query:
+    """Turns of the session newer than the summary's watermark."""
+    query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+    if summary is not None and summary.summarized_through is not None:
+        query = query.filter(
+            tuple_(ChatMessage.timestamp, ChatMessage.id) > (summary.summarized_through, summary.last_message_id)
+        )
+    return query
+
+
+def _claim_summary(db: Session, session_id: UUID, token: UUID) -> ChatSessionSummary | None:
+    """Takes the session's fold lease unless another fold holds an unexpired one."""
+    db.execute(insert(ChatSessionSummary).values(session_id=session_id, summary="", turns_summarized=0)
+               .on_conflict_do_nothing(index_elements=[ChatSessionSummary.session_id]))
+    return db.scalar(
+        update(ChatSessionSummary)
+        .where(
+            ChatSessionSummary.session_id == session_id,
+            or_(ChatSessionSummary.lease_expires_at.is_(None), ChatSessionSummary.lease_expires_at < func.now()),
+        )
+        .values(
+            lease_token=token,
+            lease_expires_at=func.now() + timedelta(seconds=settings.CHAT_SUMMARY_LEASE_SECONDS),
+        )
+        .returning(ChatSessionSummary)
+    )
+
+
+def _release_summary(session_id: UUID, token: UUID, **values) -> bool:
+    """Drops the lease, writing `values` with it. False if the lease expired and was taken over."""
+    with SessionLocal() as db:
+        updated = db.execute(
+            update(ChatSessionSummary)
+            .where(ChatSessionSummary.session_id == session_id, ChatSessionSummary.lease_token == token)
+            .values(lease_token=None, lease_expires_at=None, **values)
+        ).rowcount
+        db.commit()
+    return updated == 1
+
+
+async def fold_session_history(session_id: UUID) -> None:
+    """
+    Folds all but the most recent turns into the session's summary. A fold first claims a
+    short lease on the summary row and commits, so no transaction or connection is held while
+    Gemini runs; concurrent folds (from any process) see the lease and skip. The result is
+    written back only while the lease is still ours, so the watermark only moves forward.
+    """
+    token = uuid.uuid4()
+    claimed = False
+    try:
+        with SessionLocal() as db:
+            summary = _claim_summary(db, session_id, token)
+            if summary is None:
+                db.commit()
+                return
+            claimed = True
+            pending = (
+                unsummarized_turns(db, session_id, summary)
+                .order_by(ChatMessage.timestamp, ChatMessage.id)
+                .limit(settings.CHAT_HISTORY_MAX_TURNS * 2)
+                .all()
+            )
+            to_fold = pending[:len(pending) - settings.CHAT_SUMMARY_KEEP_RECENT_TURNS]
+            should_fold = len(pending) > settings.CHAT_SUMMARY_TRIGGER_TURNS
+            if should_fold:
+                prompt = build_session_summary_prompt(summary.summary, to_fold)
+                watermark = {
+                    "summarized_through": to_fold[-1].timestamp,
+                    "last_message_id": to_fold[-1].id,
+                    "turns_summarized": summary.turns_summarized + len(to_fold),
+                }
+            db.commit()
+
+        if not should_fold:
+            await asyncio.to_thread(_release_summary, session_id, token)
+            return
+
+        text = (await call_genai(prompt)).strip()
+        if not text:
+            await asyncio.to_thread(_release_summary, session_id, token)
+            return
+
+        if not await asyncio.to_thread(_release_summary, session_id, token, summary=text, **watermark):
+            print(f"[ChatSummary] Lease on session {session_id} expired during the fold; result dropped")
+            return
+        metrics.incr("chat_turns_summarized", len(to_fold))
+        print(f"[ChatSummary] Folded {len(to_fold)} turns into session {session_id}")
+    except Exception as e:
+        print(f"[ChatSummary] Failed for session {session_id}: {e}")
+        if claimed:
+            try:
+                await asyncio.to_thread(_release_summary, session_id, token)
+            except Exception:
+                pass  # the lease expires on its own
+
+
+def schedule_session_summary(session_id: UUID) -> None:
+    """Starts a background fold unless one is already running for this session in this process."""
+    if session_id in _in_flight:
+        return
+    _in_flight.add(session_id)
+    task = asyncio.create_task(fold_session_history(session_id))
+    _tasks.add(task)
+
+    def done(finished: asyncio.Task) -> None:
+        _tasks.discard(finished)
+        _in_flight.discard(session_id)
+
+    task.add_done_callback(done)
@@ -1,19 +1,81 @@
-from google import genai
-from ...Security.Settings import settings 
+import asyncio
+from typing import AsyncIterator
+
+from ...Security.Settings import settings
+from .Providers import PROVIDERS, GenAIProvider
+from .Resilience import GenAIUnavailable, breaker, is_transient, resilient_call
+
+_provider: GenAIProvider | None = None
+
+
+def get_genai_provider() -> GenAIProvider:
+    """
+    Returns the process-wide provider chosen by GENAI_PROVIDER. It is normally started at app
+    startup; code running outside the app (jobs, scripts) gets one lazily on first use.
+    """
+    global _provider
+    if _provider is None:
+        if settings.GENAI_PROVIDER not in PROVIDERS:
+            raise ValueError(f"Unknown GENAI_PROVIDER {settings.GENAI_PROVIDER!r}; choose from {sorted(PROVIDERS)}")
+        _provider = PROVIDERS[settings.GENAI_PROVIDER]()
+        print(f"[GenAI] Using {_provider.name} provider ({_provider.model_id})")
+    return _provider
+
+
+def genai_model_id() -> str:
+    return get_genai_provider().model_id
+
+
+async def start_genai_client() -> None:
+    await get_genai_provider().start()
+
+
+async def close_genai_client() -> None:
+    global _provider
+    if _provider is not None:
+        await _provider.close()
+        _provider = None
+
 
 async def call_genai(prompts: str) -> str:
+    provider = get_genai_provider()
+    try:
+        return await resilient_call(lambda: provider.generate(prompts))
+
+    except GenAIUnavailable:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"GenAI Model is throwing error: {e}") from e
+
+
+async def stream_genai(prompts: str) -> AsyncIterator[str]:
+    """
+    Yields text as the model generates it. Closing the iterator early (e.g. the client went away)
+    closes the underlying HTTP stream so the rest of the completion is not generated.
+    Streams go through the circuit breaker and must produce their first chunk within the
+    per-call timeout; they are not retried, since part of the reply may already be sent.
+    """
+    breaker.allow()
+    chunks = get_genai_provider().stream(prompts)
+
+    first = True
     try:
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        model_name = settings.GEMINI_MODEL
-        
-        if model_name.startswith("models/"):
-            model_name = model_name.replace("models/", "", 1)
-            
-        response = client.models.generate_content(
-            model=model_name,
-            contents=prompts
-        )
-        return response.text
-        
+        while True:
+            try:
+                if first:
+                    text = await asyncio.wait_for(anext(chunks), settings.GEMINI_CALL_TIMEOUT_SECONDS)
+                    breaker.record(True)
+                    first = False
+                else:
+                    text = await anext(chunks)
+            except StopAsyncIteration:
+                if first:
+                    breaker.record(True)
+                return
+            yield text
     except Exception as e:
-        raise RuntimeError(f"GenAI Model is throwing error: {e}") from e
\ No newline at end of file
+        if first:
+            breaker.record(not is_transient(e))
+        raise RuntimeError(f"GenAI Model is throwing error: {e}") from e
+    finally:
+        await chunks.aclose()
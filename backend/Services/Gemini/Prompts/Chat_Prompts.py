@@ -1,15 +1,46 @@
 from typing import Optional
-from ....Models.Medical_Data import HealthData
 from ....Models.System import ChatMessage
+from ....Schemas.Medical_Data_Schema import HealthDataBase
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximates Gemini's token count at ~4 characters per token. Close enough for budgeting
+    English prompts without a count_tokens round trip on every message.
+    """
+    return (len(text) + 3) // 4
+
+
+def _fit_history(session_history: list[ChatMessage], token_budget: Optional[int]) -> list[str]:
+    """Keeps the most recent turns (history is oldest first) that fit in `token_budget`."""
+    turns = []
+    remaining = token_budget
+    for message in reversed(session_history):
+        turn = f"User: {message.user_query}\nGemini: {message.ai_response}"
+        if remaining is not None:
+            cost = estimate_tokens(turn) + 1
+            if cost > remaining:
+                break
+            remaining -= cost
+        turns.append(turn)
+    turns.reverse()
+    return turns
 
 
 def build_gemini_chat_prompt(
     user_name: str,
     user_query: str,
-    latest_report: Optional[HealthData],
+    latest_report: Optional[HealthDataBase],
     session_history: list[ChatMessage],
     chat_mode: str,
+    token_budget: Optional[int] = None,
+    session_summary: Optional[str] = None,
 ) -> str:
+    """
+    `session_history` is oldest first and holds only turns not yet folded into `session_summary`.
+    With a `token_budget`, the fixed parts of the prompt (including the summary) are always kept
+    and as many of the most recent turns as fit are added.
+    """
     persona = "Gemini clinical assistant"
     if chat_mode == "doctor":
         persona = "Dr. Gemini, a medical doctor persona"
@@ -33,17 +64,12 @@ def build_gemini_chat_prompt(
             f"- SpO2: {latest_report.spo2}%\n"
         )
 
-    history_section = ""
-    if session_history:
-        history_lines = [
-            "\nConversation history:"
-        ]
-        for message in session_history:
-            history_lines.append(f"User: {message.user_query}")
-            history_lines.append(f"Gemini: {message.ai_response}")
-        history_section = "\n".join(history_lines) + "\n"
+    summary_section = ""
+    if session_summary:
+        summary_section = f"\nSummary of the earlier conversation:\n{session_summary}\n"
 
-    return f"""
+    def render(history_section: str) -> str:
+        return f"""
 You are {persona}.
 
     outside of medical don't ans anything just say sorry to help ans when something is related to medical and also if anything is complicated always add a warning in first line 
@@ -54,9 +80,38 @@ If you are unsure, recommend consulting a licensed healthcare professional.
 Always keep responses concise, patient-friendly, and actionable.
 
 {report_section}
-{history_section}
+{summary_section}{history_section}
 User name: {user_name}
 User question: {user_query}
 
 Respond only with the assistant's reply text. Do not include markdown fences, JSON wrappers, or extra metadata.
-"""
\ No newline at end of file
+"""
+
+    history_budget = None
+    if token_budget is not None:
+        history_budget = max(0, token_budget - estimate_tokens(render("\nConversation history:\n")))
+
+    history_section = ""
+    turns = _fit_history(session_history, history_budget)
+    if turns:
+        history_section = "\n".join(["\nConversation history:", *turns]) + "\n"
+
+    return render(history_section)
+
+
+def build_session_summary_prompt(previous_summary: str, turns: list[ChatMessage]) -> str:
+    conversation = "\n".join(f"User: {m.user_query}\nGemini: {m.ai_response}" for m in turns)
+    return f"""
+You maintain a running summary of a conversation between a patient and a medical assistant.
+Update the summary with the new turns below. Keep every health fact the patient shared
+(symptoms, conditions, medicines, lab values, goals) and any advice already given.
+Drop greetings and small talk. Write plain text, at most 200 words.
+
+Current summary:
+{previous_summary or "(none yet)"}
+
+New turns:
+{conversation}
+
+Respond only with the updated summary text.
+"""
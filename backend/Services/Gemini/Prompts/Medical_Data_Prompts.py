@@ -1,5 +1,8 @@
 from ....Schemas.Medical_Data_Schema import HealthDataRead
 
+# Bump whenever the template below changes so cached analyses from the old prompt are not reused.
+MEDICAL_ANALYSIS_PROMPT_VERSION = "1"
+
 def Medical_Analysis_Prompts(data : HealthDataRead) -> str:
     return f"""
     outside of medical don't ans anything just say sorry to help ans when something is related to medical and also if anything is complicated always add a warning in first line 
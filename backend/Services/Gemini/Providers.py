@@ -0,0 +1,168 @@
+import asyncio
+import json
+import math
+import random
+from typing import AsyncIterator, Optional
+
+import httpx
+from google import genai
+from google.genai import errors, types
+
+from ...Security.Settings import settings
+
+
+class GenAIProvider:
+    """What the rest of the app needs from a text model: one-shot and streamed generation."""
+
+    name: str = "base"
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the model in cache keys, so results from different providers never mix."""
+        raise NotImplementedError
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+
+# ── Google ─────────────────────────────────────────────────────────────────────
+
+class GoogleProvider(GenAIProvider):
+    """One shared async SDK client per process over a pooled httpx connection."""
+
+    name = "google"
+
+    def __init__(self) -> None:
+        self._client: genai.Client | None = None
+        self._http: httpx.AsyncClient | None = None
+
+    @property
+    def model_id(self) -> str:
+        return settings.GEMINI_MODEL.removeprefix("models/")
+
+    @property
+    def client(self) -> genai.Client:
+        # Created lazily too, so jobs running outside the app lifespan still get one.
+        if self._client is None:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.GEMINI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GEMINI_MAX_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(settings.GEMINI_HTTP_TIMEOUT_SECONDS, connect=10.0),
+            )
+            self._client = genai.Client(
+                api_key=settings.GEMINI_API_KEY,
+                http_options=types.HttpOptions(httpx_async_client=self._http),
+            )
+        return self._client
+
+    async def start(self) -> None:
+        self.client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aio.aclose()
+            self._client.close()
+            self._client = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def generate(self, prompt: str) -> str:
+        response = await self.client.aio.models.generate_content(model=self.model_id, contents=prompt)
+        return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        stream = await self.client.aio.models.generate_content_stream(model=self.model_id, contents=prompt)
+        try:
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            await stream.aclose()
+
+
+# ── fake ───────────────────────────────────────────────────────────────────────
+
+_FAKE_ANALYSES = (
+    {"cardiac_risk_score": "Low", "metabolic_status": "Normal", "kidney_status": "Normal"},
+    {"cardiac_risk_score": "Moderate", "metabolic_status": "Pre-Diabetic", "kidney_status": "Normal"},
+    {"cardiac_risk_score": "High", "metabolic_status": "Diabetic", "kidney_status": "Mild CKD"},
+)
+
+_FAKE_CHAT_REPLY = (
+    "Based on the values you shared, most of your results fall within the usual reference ranges. "
+    "Keep an eye on your cholesterol and blood sugar with regular check-ups, stay active, and eat a "
+    "balanced diet. If you notice new symptoms or have concerns, please consult a licensed healthcare "
+    "professional who can review your full history."
+)
+
+
+class FakeProvider(GenAIProvider):
+    """
+    Local stand-in for load tests and offline benchmarks. Latency is log-normal around
+    FAKE_GENAI_LATENCY_MS; a FAKE_GENAI_ERROR_RATE share of calls fail with a 503 so the
+    resilience layer is exercised too. Analysis prompts get schema-valid JSON, chat gets text.
+    """
+
+    name = "fake"
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._random = random.Random(seed)
+
+    @property
+    def model_id(self) -> str:
+        return "fake"
+
+    def _latency(self) -> float:
+        median = settings.FAKE_GENAI_LATENCY_MS / 1000
+        return median * math.exp(self._random.gauss(0, settings.FAKE_GENAI_LATENCY_SIGMA))
+
+    def _maybe_fail(self) -> None:
+        if self._random.random() < settings.FAKE_GENAI_ERROR_RATE:
+            raise errors.ServerError(503, {"error": {"code": 503, "message": "fake provider error", "status": "UNAVAILABLE"}})
+
+    def _reply(self, prompt: str) -> str:
+        if '"cardiac_risk_score"' in prompt:
+            analysis = dict(self._random.choice(_FAKE_ANALYSES))
+            analysis["ai_summary"] = (
+                f"Your cardiac risk looks {analysis['cardiac_risk_score'].lower()} and your metabolic status is "
+                f"{analysis['metabolic_status'].lower()}. Kidney function appears {analysis['kidney_status'].lower()}. "
+                "Discuss these results with your doctor at your next visit."
+            )
+            return json.dumps(analysis)
+        return _FAKE_CHAT_REPLY
+
+    async def generate(self, prompt: str) -> str:
+        await asyncio.sleep(self._latency())
+        self._maybe_fail()
+        return self._reply(prompt)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        reply = self._reply(prompt)
+        chunks = max(1, settings.FAKE_GENAI_STREAM_CHUNKS)
+        total = self._latency()
+        # Time to first chunk is modelled as a fifth of the full completion time.
+        await asyncio.sleep(total / 5)
+        self._maybe_fail()
+        size = math.ceil(len(reply) / chunks)
+        for start in range(0, len(reply), size):
+            if start:
+                await asyncio.sleep(total * 4 / 5 / chunks)
+            yield reply[start:start + size]
+
+
+PROVIDERS: dict[str, type[GenAIProvider]] = {
+    "google": GoogleProvider,
+    "fake": FakeProvider,
+}
@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from google.genai import errors
+
+from ...Security.Settings import settings
+from ..Metrics import metrics
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class GenAIUnavailable(RuntimeError):
+    """Raised without calling Gemini while the circuit breaker is open."""
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return False
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of the last `window` calls. Once at least `min_calls` have been seen and
+    the share of transient failures reaches `error_rate`, the breaker opens and calls fail fast
+    for `open_seconds`. After that one probe call is let through; its outcome closes or re-opens it.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, window: int, min_calls: int, error_rate: float, open_seconds: float) -> None:
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self._publish()
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_started = None
+            self._publish()
+        return self._state
+
+    def allow(self) -> None:
+        state = self.state
+        if state == self.CLOSED:
+            return
+        # A probe that never reported back (e.g. cancelled) is replaced after open_seconds.
+        now = time.monotonic()
+        if state == self.HALF_OPEN and (
+            self._probe_started is None or now - self._probe_started >= self.open_seconds
+        ):
+            self._probe_started = now
+            return
+        metrics.incr("genai_breaker_rejections")
+        raise GenAIUnavailable("Gemini circuit breaker is open; try again shortly.")
+
+    def record(self, ok: bool) -> None:
+        if self._state == self.HALF_OPEN:
+            self._outcomes.clear()
+            self._set(self.CLOSED if ok else self.OPEN)
+            return
+        self._outcomes.append(ok)
+        failures = self._outcomes.count(False)
+        if (
+            self._state == self.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.error_rate
+        ):
+            self._set(self.OPEN)
+
+    def _set(self, state: str) -> None:
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            print(f"[GenAI] Circuit breaker opened for {self.open_seconds:.0f}s")
+        self._state = state
+        self._probe_started = None
+        self._publish()
+
+    def _publish(self) -> None:
+        metrics.gauge("genai_breaker_open", 1 if self._state == self.OPEN else 0)
+        metrics.gauge("genai_breaker_half_open", 1 if self._state == self.HALF_OPEN else 0)
+
+
+class LatencyTracker:
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float, min_samples: int) -> Optional[float]:
+        if len(self._samples) < min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+breaker = CircuitBreaker(
+    window=settings.GEMINI_BREAKER_WINDOW,
+    min_calls=settings.GEMINI_BREAKER_MIN_CALLS,
+    error_rate=settings.GEMINI_BREAKER_ERROR_RATE,
+    open_seconds=settings.GEMINI_BREAKER_OPEN_SECONDS,
+)
+latencies = LatencyTracker()
+
+
+async def _hedged(call: Callable[[], Awaitable[T]], timeout: float) -> T:
+    """
+    Runs `call`; if it has not finished by the recent p95 latency, starts a second copy and
+    returns whichever succeeds first. Hedging stays off until enough latencies are recorded.
+    """
+    hedge_after = (
+        latencies.percentile(0.95, settings.GEMINI_HEDGE_MIN_SAMPLES)
+        if settings.GEMINI_HEDGE_ENABLED
+        else None
+    )
+    if hedge_after is None or hedge_after >= timeout:
+        return await asyncio.wait_for(call(), timeout)
+
+    deadline = time.monotonic() + timeout
+    tasks = {asyncio.ensure_future(call())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            metrics.incr("genai_hedges")
+            tasks.add(asyncio.ensure_future(call()))
+        error: BaseException | None = None
+        while tasks:
+            remaining = deadline - time.monotonic()
+            done, _ = await asyncio.wait(tasks, timeout=max(remaining, 0), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                raise asyncio.TimeoutError()
+            for task in done:
+                tasks.discard(task)
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def resilient_call(call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Calls Gemini through the breaker with a per-attempt timeout, an overall deadline and
+    jittered exponential retries for transient errors. Non-transient errors are raised at once.
+    """
+    deadline = time.monotonic() + settings.GEMINI_DEADLINE_SECONDS
+    attempt = 0
+    while True:
+        breaker.allow()
+        remaining = deadline - time.monotonic()
+        started = time.perf_counter()
+        try:
+            result = await _hedged(call, min(settings.GEMINI_CALL_TIMEOUT_SECONDS, remaining))
+        except Exception as e:
+            transient = is_transient(e)
+            # A 4xx other than 408/429 is our request's fault, not the endpoint's health.
+            breaker.record(not transient)
+            metrics.incr("genai_errors", transient=transient)
+
+            backoff = random.uniform(0, settings.GEMINI_RETRY_BASE_SECONDS * 2 ** attempt)
+            if not transient or attempt >= settings.GEMINI_MAX_RETRIES or time.monotonic() + backoff >= deadline:
+                raise
+            attempt += 1
+            metrics.incr("genai_retries")
+            await asyncio.sleep(backoff)
+            continue
+
+        took = time.perf_counter() - started
+        breaker.record(True)
+        latencies.add(took)
+        metrics.observe("genai_call_seconds", took)
+        return result
@@ -0,0 +1,203 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import bindparam, func, insert, update
+
+from ..DataBase.Database import SessionLocal
+from ..Models.Messaging import Conversation, DirectMessage
+from ..Schemas.Message_Schema import DirectMessageRead
+from ..Security.Settings import settings
+from .Connection_Manager import manager
+from .Metrics import metrics
+
+
+class MessageWriterClosed(RuntimeError):
+    pass
+
+
+def message_event(message: DirectMessageRead) -> dict:
+    """The socket event announcing a saved message."""
+    return {"type": "message", "data": message.model_dump(mode="json")}
+
+
+@dataclass
+class _PendingMessage:
+    conversation_id: uuid.UUID
+    sender_id: uuid.UUID
+    content: str
+    recipient_id: Optional[uuid.UUID] = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    saved: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class MessageWriter:
+    """
+    Group commit for chat messages. Callers queue a message and wait; one task collects
+    whatever arrives within `window_seconds` (up to `max_batch`) and writes it in a single
+    transaction on a worker thread: one multi-row INSERT, one last_message_at update per
+    conversation, and the backplane notifications for the recipients. Each caller is
+    released only after that transaction has committed.
+    """
+
+    def __init__(self, window_seconds: float, max_batch: int) -> None:
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._queue = asyncio.Queue(maxsize=self.max_batch * 10)
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Refuses new writes, writes everything already accepted, then stops."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        # Writers that were waiting for room in a full queue when closing began land after
+        # the sentinel; each get frees a slot for the next of them.
+        while True:
+            await asyncio.sleep(0)
+            if self._queue.empty():
+                break
+            batch = []
+            while not self._queue.empty() and len(batch) < self.max_batch:
+                item = self._queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            if batch:
+                await self._flush(batch)
+        self._task = None
+
+    async def write(
+        self,
+        conversation_id: uuid.UUID,
+        sender_id: uuid.UUID,
+        content: str,
+        recipient_id: Optional[uuid.UUID] = None,
+    ) -> DirectMessageRead:
+        """
+        Saves a message and returns it once committed. `recipient_id`, if given, is sent the
+        message event over the backplane by that same commit; delivering to the recipient's
+        sockets on this process is left to the caller (see `message_event`).
+        """
+        if self._closing:
+            raise MessageWriterClosed("Message writer is shutting down.")
+        if self._task is None:
+            await self.start()
+        pending = _PendingMessage(conversation_id, sender_id, content, recipient_id)
+        await self._queue.put(pending)
+        return await pending.saved
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.window_seconds
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                try:
+                    if remaining > 0:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_PendingMessage]) -> None:
+        started = time.perf_counter()
+        try:
+            saved = await asyncio.to_thread(_persist, batch)
+        except Exception as e:
+            if len(batch) == 1:
+                _settle(batch, error=e)
+                return
+            # Keep one bad message (e.g. a deleted conversation) from failing its neighbours.
+            print(f"[MessageWriter] Batch of {len(batch)} failed ({type(e).__name__}); retrying one by one")
+            for pending in batch:
+                await self._flush([pending])
+            return
+        metrics.observe("message_writer_commit_seconds", time.perf_counter() - started)
+        metrics.observe_value("message_writer_batch_size", len(batch))
+        _settle(batch, saved=saved)
+
+
+def _settle(batch: list[_PendingMessage], saved: Optional[dict] = None, error: Optional[Exception] = None) -> None:
+    for pending in batch:
+        if pending.saved.done():
+            continue
+        if error is not None:
+            pending.saved.set_exception(error)
+        else:
+            pending.saved.set_result(saved[pending.id])
+
+
+def _persist(batch: list[_PendingMessage]) -> dict[uuid.UUID, DirectMessageRead]:
+    # Rows share the transaction's now(); the microsecond offsets keep a sender's burst in the
+    # order it was sent when history is read back by (created_at, id).
+    rows = [
+        {
+            "id": pending.id,
+            "conversation_id": pending.conversation_id,
+            "sender_id": pending.sender_id,
+            "content": pending.content,
+            "is_read": False,
+            "created_at": func.now() + timedelta(microseconds=position),
+        }
+        for position, pending in enumerate(batch)
+    ]
+    with SessionLocal() as db:
+        inserted = db.execute(
+            insert(DirectMessage).values(rows).returning(
+                DirectMessage.id,
+                DirectMessage.conversation_id,
+                DirectMessage.sender_id,
+                DirectMessage.content,
+                DirectMessage.is_read,
+                DirectMessage.created_at,
+            )
+        ).all()
+
+        saved = {row.id: DirectMessageRead.model_validate(row) for row in inserted}
+        # Queued on this transaction, so recipients elsewhere hear about exactly what committed.
+        for pending in batch:
+            if pending.recipient_id is not None:
+                manager.backplane.publish_on_commit(db, pending.recipient_id, message_event(saved[pending.id]))
+
+        latest: dict[uuid.UUID, object] = {}
+        for row in inserted:
+            if row.conversation_id not in latest or row.created_at > latest[row.conversation_id]:
+                latest[row.conversation_id] = row.created_at
+        db.execute(
+            update(Conversation.__table__)
+            .where(Conversation.__table__.c.id == bindparam("conversation"))
+            .values(last_message_at=bindparam("sent_at")),
+            [{"conversation": conversation_id, "sent_at": sent_at} for conversation_id, sent_at in latest.items()],
+        )
+        db.commit()
+
+    return saved
+
+
+message_writer = MessageWriter(
+    settings.MESSAGE_WRITER_WINDOW_MS / 1000,
+    settings.MESSAGE_WRITER_MAX_BATCH,
+)
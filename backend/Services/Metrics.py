@@ -0,0 +1,67 @@
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """
+    Process-local counters and timings. Values live per worker process; they are meant
+    for comparing code paths on a running instance, not as a cross-worker aggregate.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._timings: dict[str, dict[str, float]] = {}
+        self._gauges: dict[str, float] = {}
+        self._values: dict[str, dict[str, float]] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> str:
+        if not labels:
+            return name
+        return name + "{" + ",".join(f"{k}={labels[k]}" for k in sorted(labels)) + "}"
+
+    def incr(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            self._counters[self._key(name, labels)] += value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            timing = self._timings.setdefault(key, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            timing["count"] += 1
+            timing["total_seconds"] += seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def observe_value(self, name: str, value: float, **labels) -> None:
+        """Like observe(), for quantities that are not durations (sizes, token counts)."""
+        key = self._key(name, labels)
+        with self._lock:
+            summary = self._values.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0})
+            summary["count"] += 1
+            summary["total"] += value
+            summary["max"] = max(summary["max"], value)
+
+    def gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            timings = {
+                key: {**timing, "avg_seconds": timing["total_seconds"] / timing["count"]}
+                for key, timing in self._timings.items()
+            }
+            values = {
+                key: {**summary, "avg": summary["total"] / summary["count"]}
+                for key, summary in self._values.items()
+            }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": timings,
+                "values": values,
+            }
+
+
+metrics = Metrics()
@@ -0,0 +1,267 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..Security.Settings import settings
+from .Biomarker_Scanner import BiomarkerScan
+from .Metrics import metrics
+from .PDF_Extractor import PAGE_SEPARATOR, PDF_TEXT_BACKENDS, ReportExtraction, extract_health_report
+from .PDF_OCR import ocr_page
+
+
+class ExtractionQueueFull(RuntimeError):
+    pass
+
+
+class ExtractionTimeout(RuntimeError):
+    pass
+
+
+class ExtractionUnavailable(RuntimeError):
+    """The worker pool broke (e.g. a worker was killed) and a rebuilt pool failed as well."""
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    fields: dict
+    pages_parsed: int
+    backend: str
+    queue_wait_ms: float
+    extraction_ms: float
+    ocr_pages: int = 0
+
+
+def _run_extraction(
+    pdf_path: str, page_budget: int, backend: str, submitted_at: float
+) -> tuple[ReportExtraction, float, float]:
+    # Runs inside a worker process; wall-clock time is comparable across processes on one host.
+    started_at = time.time()
+    report = extract_health_report(pdf_path, page_budget, backend)
+    return report, started_at - submitted_at, time.time() - started_at
+
+
+class _Admission:
+    """
+    One admission slot. It is held until the call has returned and every job it submitted has
+    finished, so a job abandoned on timeout keeps occupying its slot while a worker still runs it.
+    """
+
+    def __init__(self, pool: "ExtractionPool") -> None:
+        self._pool = pool
+        self._loop = asyncio.get_running_loop()
+        self._open = 1
+
+    def track(self, future: Future) -> None:
+        self._open += 1
+        future.add_done_callback(self._job_done)
+
+    def _job_done(self, _: Future) -> None:
+        # Called from the executor's management thread.
+        try:
+            self._loop.call_soon_threadsafe(self.release)
+        except RuntimeError:
+            pass  # loop already closed at shutdown
+
+    def release(self) -> None:
+        self._open -= 1
+        if self._open == 0:
+            self._pool._in_flight -= 1
+
+
+class ExtractionPool:
+    """
+    Bounded process pool for CPU-bound PDF work so uploads never run pdfplumber on the event loop.
+    At most `workers + max_queue` jobs are admitted at once; the rest are rejected immediately.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        timeout_seconds: float,
+        max_queue: int,
+        page_budget: int,
+        backend: str,
+        ocr_enabled: bool = False,
+        ocr_dpi: int = 200,
+        ocr_language: str = "eng",
+        ocr_timeout_seconds: float = 120.0,
+    ) -> None:
+        if backend not in PDF_TEXT_BACKENDS:
+            raise ValueError(f"Unknown PDF text backend {backend!r}; choose from {sorted(PDF_TEXT_BACKENDS)}")
+        self.workers = max(1, workers)
+        self.timeout_seconds = timeout_seconds
+        self.max_queue = max(0, max_queue)
+        self.page_budget = page_budget
+        self.backend = backend
+        self.ocr_enabled = ocr_enabled
+        self.ocr_dpi = ocr_dpi
+        self.ocr_language = ocr_language
+        self.ocr_timeout_seconds = ocr_timeout_seconds
+        self._executor: ProcessPoolExecutor | None = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _replace_broken_executor(self, broken: ProcessPoolExecutor) -> None:
+        if self._executor is broken:
+            self._executor = None
+            broken.shutdown(wait=False, cancel_futures=True)
+            metrics.incr("pdf_extraction_pool_restarts")
+            print("[Extraction] Worker pool broke; starting a new one")
+
+    async def _submit(self, admission: _Admission, fn, *args):
+        """Runs `fn` on the pool, rebuilding the pool once if it turns out to be broken."""
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._replace_broken_executor(executor)
+                continue
+            admission.track(future)
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                self._replace_broken_executor(executor)
+                if attempt:
+                    break
+        raise ExtractionUnavailable("PDF worker pool is unavailable.")
+
+    async def extract(self, pdf_path: Path) -> ExtractionResult:
+        if self._in_flight >= self.workers + self.max_queue:
+            metrics.incr("pdf_extraction_rejected")
+            raise ExtractionQueueFull(
+                f"Extraction queue is full ({self._in_flight} jobs in flight)."
+            )
+
+        self._in_flight += 1
+        admission = _Admission(self)
+        try:
+            job = self._submit(admission, _run_extraction, str(pdf_path), self.page_budget, self.backend, time.time())
+            try:
+                report, queue_wait, took = await asyncio.wait_for(job, self.timeout_seconds)
+            except asyncio.TimeoutError:
+                metrics.incr("pdf_extraction_timeouts")
+                raise ExtractionTimeout(
+                    f"PDF extraction exceeded {self.timeout_seconds:g}s."
+                )
+
+            result = ExtractionResult(
+                text=report.text,
+                fields=report.fields,
+                pages_parsed=report.pages_parsed,
+                backend=report.backend,
+                queue_wait_ms=max(queue_wait, 0.0) * 1000,
+                extraction_ms=took * 1000,
+            )
+
+            if self.ocr_enabled and report.pages_parsed and not report.text.strip():
+                started = time.perf_counter()
+                try:
+                    pages, fields = await asyncio.wait_for(
+                        self._ocr(admission, pdf_path, report.pages_parsed), self.ocr_timeout_seconds
+                    )
+                except asyncio.TimeoutError:
+                    metrics.incr("pdf_ocr_timeouts")
+                    raise ExtractionTimeout(
+                        f"OCR exceeded {self.ocr_timeout_seconds:g}s."
+                    )
+                took = time.perf_counter() - started
+                metrics.observe("pdf_ocr_seconds", took)
+                metrics.incr("pdf_ocr_pages", len(pages))
+                result.text = PAGE_SEPARATOR.join(pages)
+                result.fields = fields
+                result.ocr_pages = len(pages)
+                result.backend = "ocr"
+                result.extraction_ms += took * 1000
+        finally:
+            admission.release()
+
+        for name, seconds in report.backend_seconds.items():
+            metrics.observe("pdf_backend_seconds", seconds, backend=name)
+        metrics.incr("pdf_backend_pages", report.pages_parsed, backend=report.backend)
+        if report.fell_back:
+            metrics.incr("pdf_backend_fallbacks", backend=self.backend)
+        metrics.observe("pdf_extraction_queue_wait_seconds", result.queue_wait_ms / 1000)
+
+        print(
+            f"[Extraction] backend={result.backend} pages={result.pages_parsed} ocr_pages={result.ocr_pages} "
+            f"queue_wait={result.queue_wait_ms:.1f}ms extraction={result.extraction_ms:.1f}ms "
+            f"in_flight={self._in_flight}"
+        )
+        return result
+
+    async def _ocr(self, admission: _Admission, pdf_path: Path, page_count: int) -> tuple[list[str], dict]:
+        """
+        OCRs pages across the pool with at most one page per worker in flight, feeding
+        results to the scanner in page order and stopping once every field is found.
+        """
+        scan = BiomarkerScan()
+        texts: dict[int, str] = {}
+        pending: dict[asyncio.Future, int] = {}
+        next_page = 0
+        next_feed = 0
+
+        try:
+            while (next_page < page_count or pending) and not scan.filled:
+                while next_page < page_count and len(pending) < self.workers:
+                    job = asyncio.ensure_future(self._submit(
+                        admission, ocr_page, str(pdf_path), next_page, self.ocr_dpi, self.ocr_language
+                    ))
+                    pending[job] = next_page
+                    next_page += 1
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for job in done:
+                    index = pending.pop(job)
+                    try:
+                        texts[index] = job.result()
+                    except ExtractionUnavailable:
+                        raise
+                    except Exception as e:
+                        print(f"[Extraction] OCR failed on page {index + 1} of {pdf_path}: {e}")
+                        texts[index] = ""
+
+                while next_feed in texts and not scan.filled:
+                    if next_feed:
+                        scan.feed(PAGE_SEPARATOR)
+                    scan.feed(texts[next_feed])
+                    next_feed += 1
+        finally:
+            for job in pending:
+                job.cancel()
+
+        return [texts[index] for index in range(next_feed)], scan.result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+extraction_pool = ExtractionPool(
+    workers=settings.PDF_EXTRACTION_WORKERS,
+    timeout_seconds=settings.PDF_EXTRACTION_TIMEOUT_SECONDS,
+    max_queue=settings.PDF_EXTRACTION_MAX_QUEUE,
+    page_budget=settings.PDF_PAGE_BUDGET,
+    backend=settings.PDF_TEXT_BACKEND,
+    ocr_enabled=settings.PDF_OCR_ENABLED,
+    ocr_dpi=settings.PDF_OCR_DPI,
+    ocr_language=settings.PDF_OCR_LANGUAGE,
+    ocr_timeout_seconds=settings.PDF_OCR_TIMEOUT_SECONDS,
+)
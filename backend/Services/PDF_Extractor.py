@@ -1,109 +1,149 @@
-import pdfplumber
-import re
-from io import BytesIO
-from typing import Optional
-
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
-    text = ""
-    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
-
-
-def _find_float(patterns: list[str], text: str) -> Optional[float]:
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            try:
-                return float(match.group(1))
-            except ValueError:
-                continue
-    return None
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from .Biomarker_Scanner import BiomarkerScan, scan_biomarkers
+
+PageIterator = Callable[[str | Path, Optional[int]], Iterator[str]]
+
+FALLBACK_BACKEND = "pdfplumber"
+# Joins page texts everywhere: the scanner sees, and report texts store, exactly the same string.
+PAGE_SEPARATOR = "\n"
+
+
+@dataclass
+class ReportExtraction:
+    text: str
+    fields: dict
+    pages_parsed: int
+    backend: str = FALLBACK_BACKEND
+    fell_back: bool = False
+    backend_seconds: dict[str, float] = field(default_factory=dict)
 
 
-def _find_int(patterns: list[str], text: str) -> Optional[int]:
-    val = _find_float(patterns, text)
-    return int(val) if val is not None else None
+# ── text backends ──────────────────────────────────────────────────────────────
+# Each backend yields page text one page at a time and releases the page before the next.
 
+def _pdfplumber_pages(pdf_path: str | Path, max_pages: Optional[int] = None) -> Iterator[str]:
+    import pdfplumber
 
-def _find_bp(text: str) -> Optional[str]:
-    match = re.search(r"Blood\s*Pressure[\s:]+(\d{2,3}/\d{2,3})", text, re.IGNORECASE)
-    if not match:
-        match = re.search(r"\b(\d{2,3}/\d{2,3}\s*mmhg)", text, re.IGNORECASE)
-    return match.group(1) if match else None
+    with pdfplumber.open(pdf_path) as pdf:
+        for index, page in enumerate(pdf.pages):
+            if max_pages is not None and index >= max_pages:
+                break
+            try:
+                yield page.extract_text() or ""
+            finally:
+                page.close()
+
+
+def _pypdfium2_pages(pdf_path: str | Path, max_pages: Optional[int] = None) -> Iterator[str]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        count = len(pdf) if max_pages is None else min(len(pdf), max_pages)
+        for index in range(count):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range() or ""
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _pdfminer_pages(pdf_path: str | Path, max_pages: Optional[int] = None) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    for layout in extract_pages(pdf_path, maxpages=max_pages or 0):
+        yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+PDF_TEXT_BACKENDS: dict[str, PageIterator] = {
+    "pypdfium2": _pypdfium2_pages,
+    "pdfminer": _pdfminer_pages,
+    "pdfplumber": _pdfplumber_pages,
+}
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    backend = backend or FALLBACK_BACKEND
+    if backend not in PDF_TEXT_BACKENDS:
+        raise ValueError(f"Unknown PDF text backend {backend!r}; choose from {sorted(PDF_TEXT_BACKENDS)}")
+    return backend
+
+
+# ── extraction ─────────────────────────────────────────────────────────────────
+
+def iter_page_texts(
+    pdf_path: str | Path,
+    max_pages: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> Iterator[str]:
+    return PDF_TEXT_BACKENDS[_resolve_backend(backend)](pdf_path, max_pages)
+
+
+def extract_text_from_pdf(pdf_path: str | Path, backend: Optional[str] = None) -> str:
+    return PAGE_SEPARATOR.join(iter_page_texts(pdf_path, backend=backend))
+
+
+def _scan_pages(pdf_path: str | Path, page_budget: Optional[int], backend: str) -> tuple[list[str], BiomarkerScan]:
+    scan = BiomarkerScan()
+    pages: list[str] = []
+    for page_text in PDF_TEXT_BACKENDS[backend](pdf_path, page_budget):
+        if pages:
+            scan.feed(PAGE_SEPARATOR)
+        pages.append(page_text)
+        scan.feed(page_text)
+        if scan.filled:
+            break
+    return pages, scan
+
+
+def extract_health_report(
+    pdf_path: str | Path,
+    page_budget: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> ReportExtraction:
+    """
+    Feeds pages into the biomarker scanner as they are extracted and stops as soon as
+    every field has a value or `page_budget` pages have been read. If the configured
+    backend fails or yields no text, the file is re-read with pdfplumber.
+    """
+    backend = _resolve_backend(backend)
+    timings: dict[str, float] = {}
+
+    started = time.perf_counter()
+    try:
+        pages, scan = _scan_pages(pdf_path, page_budget, backend)
+    except Exception as e:
+        if backend == FALLBACK_BACKEND:
+            raise
+        print(f"[Extraction] {backend} failed on {pdf_path}: {e}")
+        pages, scan = [], BiomarkerScan()
+    timings[backend] = time.perf_counter() - started
+
+    used = backend
+    if backend != FALLBACK_BACKEND and not any(page.strip() for page in pages):
+        started = time.perf_counter()
+        pages, scan = _scan_pages(pdf_path, page_budget, FALLBACK_BACKEND)
+        timings[FALLBACK_BACKEND] = time.perf_counter() - started
+        used = FALLBACK_BACKEND
+
+    return ReportExtraction(
+        text=PAGE_SEPARATOR.join(pages),
+        fields=scan.result(),
+        pages_parsed=len(pages),
+        backend=used,
+        fell_back=used != backend,
+        backend_seconds=timings,
+    )
 
 
 def parse_health_fields(text: str) -> dict:
-    return {
-        "ldl_cholesterol": _find_float([
-            r"LDL[\s\-]*Cholesterol[\s:]+(\d+\.?\d*)",
-            r"LDL[\s:]+(\d+\.?\d*)",
-            r"Low\s+Density\s+Lipoprotein[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "hdl_cholesterol": _find_float([
-            r"HDL[\s\-]*Cholesterol[\s:]+(\d+\.?\d*)",
-            r"HDL[\s:]+(\d+\.?\d*)",
-            r"High\s+Density\s+Lipoprotein[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "triglycerides": _find_float([
-            r"Triglycerides?[\s:]+(\d+\.?\d*)",
-            r"TG[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "hba1c": _find_float([
-            r"HbA1c[\s:]+(\d+\.?\d*)",
-            r"Glycated\s+Hae?moglobin[\s:]+(\d+\.?\d*)",
-            r"Glycohaemoglobin[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "fasting_glucose": _find_float([
-            r"Fasting[\s\-]*Glucose[\s:]+(\d+\.?\d*)",
-            r"Blood\s+Glucose[\s\-]*Fasting[\s:]+(\d+\.?\d*)",
-            r"FBS[\s:]+(\d+\.?\d*)",
-            r"F\.?\s*Blood\s+Sugar[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "haemoglobin": _find_float([
-            r"Hae?moglobin[\s:]+(\d+\.?\d*)",
-            r"\bHb[\s:]+(\d+\.?\d*)",
-            r"\bHGB[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "wbc_count": _find_int([
-            r"WBC[\s\-]*Count[\s:]+(\d+\.?\d*)",
-            r"White\s+Blood\s+Cell[\s\-]*Count[\s:]+(\d+\.?\d*)",
-            r"\bTLC[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "platelet_count": _find_int([
-            r"Platelet[\s\-]*Count[\s:]+(\d+\.?\d*)",
-            r"\bPLT[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "alt_ast": _find_float([
-            r"ALT[\s:]+(\d+\.?\d*)",
-            r"SGPT[\s:]+(\d+\.?\d*)",
-            r"Alanine\s+Aminotransferase[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "egfr": _find_float([
-            r"eGFR[\s:]+(\d+\.?\d*)",
-            r"Estimated\s+GFR[\s:]+(\d+\.?\d*)",
-        ], text),
-
-        "resting_heart_rate": _find_int([
-            r"(?:Resting\s+)?Heart\s+Rate[\s:]+(\d+)",
-            r"Pulse\s+Rate[\s:]+(\d+)",
-            r"\bPR[\s:]+(\d+)\s*bpm",
-        ], text),
-
-        "blood_pressure": _find_bp(text),
-
-        "spo2": _find_float([
-            r"SpO2[\s:]+(\d+\.?\d*)",
-            r"Oxygen\s+Saturation[\s:]+(\d+\.?\d*)",
-        ], text),
-    }
\ No newline at end of file
+    return scan_biomarkers(text)
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+
+def ocr_page(pdf_path: str | Path, page_index: int, dpi: int, language: str) -> str:
+    """
+    Rasterizes and OCRs a single page. Runs in an extraction worker; each call opens the
+    document, renders only its own page and frees the bitmap before returning, so a worker
+    never holds more than one page image.
+    """
+    import pypdfium2 as pdfium
+    import pytesseract
+
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        page = pdf[page_index]
+        bitmap = page.render(scale=dpi / 72, grayscale=True)
+        image = bitmap.to_pil()
+        try:
+            return pytesseract.image_to_string(image, lang=language) or ""
+        finally:
+            image.close()
+            bitmap.close()
+            page.close()
+    finally:
+        pdf.close()
\ No newline at end of file
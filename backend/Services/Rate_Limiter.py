@@ -0,0 +1,243 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import Float, cast, delete, extract, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from ..DataBase.Database import SessionLocal
+from ..Models.System import RateLimitBucket
+from ..Security.Dependencies import get_current_user
+from ..Security.Settings import settings
+from .Metrics import metrics
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """`limit` requests per `period_seconds`, with bursts of up to `burst` (default: `limit`)."""
+
+    name: str
+    limit: int
+    period_seconds: float = 60.0
+    burst: Optional[int] = None
+
+    @property
+    def capacity(self) -> float:
+        return float(self.burst or self.limit)
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.limit / self.period_seconds
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    remaining: float
+    retry_after: float = 0.0
+
+
+def _decide(policy: RateLimitPolicy, tokens: float, cost: float, allowed: bool) -> RateLimitDecision:
+    if allowed:
+        return RateLimitDecision(True, tokens)
+    return RateLimitDecision(False, tokens, (cost - tokens) / policy.refill_per_second)
+
+
+class RateLimitStore:
+    """
+    Holds one token bucket per key. `take` refills the bucket for the time since its last
+    update, then spends `cost` tokens if there are enough; both steps are O(1) per call.
+    """
+
+    name: str = "base"
+
+    def take(self, key: str, policy: RateLimitPolicy, cost: float = 1.0) -> RateLimitDecision:
+        raise NotImplementedError
+
+
+# ── in-process ─────────────────────────────────────────────────────────────────
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Buckets in a per-process LRU. Evicting an idle bucket is harmless once it has refilled,
+    and at worst forgives a partially spent one. Limits are per worker process.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, policy: RateLimitPolicy, cost: float = 1.0) -> RateLimitDecision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (policy.capacity, now))
+            tokens = min(policy.capacity, tokens + (now - updated) * policy.refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return _decide(policy, tokens, cost, allowed)
+
+
+# ── Postgres ───────────────────────────────────────────────────────────────────
+
+class PostgresRateLimitStore(RateLimitStore):
+    """
+    Buckets in the rate_limit_buckets table, shared by every worker. One conditional upsert
+    per allowed request, timed by the database clock. Buckets idle for longer than the
+    slowest refill seen by this process are purged about once a minute.
+    """
+
+    name = "postgres"
+    PURGE_INTERVAL_SECONDS = 60.0
+
+    def __init__(self) -> None:
+        self._refill_horizon = 0.0
+        self._next_purge = 0.0
+
+    def take(self, key: str, policy: RateLimitPolicy, cost: float = 1.0) -> RateLimitDecision:
+        now = cast(extract("epoch", func.now()), Float)
+        refilled = func.least(
+            policy.capacity,
+            RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * policy.refill_per_second,
+        )
+        statement = insert(RateLimitBucket).values(key=key, tokens=policy.capacity - cost, updated_at=now)
+        statement = statement.on_conflict_do_update(
+            index_elements=[RateLimitBucket.key],
+            set_={"tokens": refilled - cost, "updated_at": now},
+            where=refilled >= cost,
+        ).returning(RateLimitBucket.tokens)
+
+        with SessionLocal() as db:
+            tokens = db.scalar(statement)
+            allowed = tokens is not None
+            if not allowed:
+                tokens = db.scalar(select(refilled).where(RateLimitBucket.key == key))
+            self._purge(db, policy)
+            db.commit()
+        return _decide(policy, tokens, cost, allowed)
+
+    def _purge(self, db, policy: RateLimitPolicy) -> None:
+        self._refill_horizon = max(self._refill_horizon, policy.capacity / policy.refill_per_second)
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + self.PURGE_INTERVAL_SECONDS
+        cutoff = cast(extract("epoch", func.now()), Float) - self._refill_horizon
+        db.execute(delete(RateLimitBucket).where(RateLimitBucket.updated_at < cutoff))
+
+
+# ── Redis ──────────────────────────────────────────────────────────────────────
+
+# Runs atomically on the server, timed by the server clock. Each bucket expires once it
+# would have refilled completely, so idle keys clean themselves up.
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Buckets in any server speaking the Redis protocol with Lua scripting (Redis, Valkey,
+    KeyDB). Pass `client` to use an existing connection, e.g. a fakeredis instance in tests.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "ratelimit:") -> None:
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url or settings.RATE_LIMIT_REDIS_URL)
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    def take(self, key: str, policy: RateLimitPolicy, cost: float = 1.0) -> RateLimitDecision:
+        allowed, tokens = self._script(
+            keys=[self.prefix + key],
+            args=[policy.capacity, policy.refill_per_second, cost],
+        )
+        return _decide(policy, float(tokens), cost, bool(allowed))
+
+
+RATE_LIMIT_STORES: dict[str, Callable[[], RateLimitStore]] = {
+    "memory": lambda: MemoryRateLimitStore(settings.RATE_LIMIT_MEMORY_MAX_KEYS),
+    "postgres": PostgresRateLimitStore,
+    "redis": RedisRateLimitStore,
+}
+
+_store: RateLimitStore | None = None
+
+
+def get_rate_limit_store() -> RateLimitStore:
+    global _store
+    if _store is None:
+        if settings.RATE_LIMIT_BACKEND not in RATE_LIMIT_STORES:
+            raise ValueError(
+                f"Unknown RATE_LIMIT_BACKEND {settings.RATE_LIMIT_BACKEND!r}; choose from {sorted(RATE_LIMIT_STORES)}"
+            )
+        _store = RATE_LIMIT_STORES[settings.RATE_LIMIT_BACKEND]()
+        print(f"[RateLimit] Using {_store.name} store")
+    return _store
+
+
+# ── route dependencies ─────────────────────────────────────────────────────────
+
+CHAT_POLICY = RateLimitPolicy("chat", settings.RATE_LIMIT_CHAT_PER_MINUTE)
+UPLOAD_POLICY = RateLimitPolicy("upload", settings.RATE_LIMIT_UPLOAD_PER_MINUTE)
+
+
+def enforce_rate_limit(policy: RateLimitPolicy, subject: str, cost: float = 1.0) -> None:
+    """
+    Raises 429 when `subject` has used up `policy`. If the store is unreachable the request
+    is let through: a limiter outage should not take the API down with it.
+    """
+    try:
+        decision = get_rate_limit_store().take(f"{policy.name}:{subject}", policy, cost)
+    except Exception as e:
+        metrics.incr("rate_limit_store_errors", policy=policy.name)
+        print(f"[RateLimit] Store error, allowing request: {e}")
+        return
+
+    if not decision.allowed:
+        metrics.incr("rate_limit_rejected", policy=policy.name)
+        retry_after = max(1, math.ceil(decision.retry_after))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded. Max {policy.limit} requests per {policy.period_seconds:g} seconds.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def rate_limit(policy: RateLimitPolicy, cost: float = 1.0):
+    """Route dependency limiting each authenticated user: `dependencies=[Depends(rate_limit(CHAT_POLICY))]`."""
+
+    def dependency(current_user=Depends(get_current_user)) -> None:
+        enforce_rate_limit(policy, str(current_user.id), cost)
+
+    return dependency
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import uuid
+from datetime import timedelta
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import delete, func, text
+from sqlalchemy.orm import Session
+
+from ..DataBase.Database import SessionLocal, engine
+from ..Models.Messaging import RealtimeEvent
+from .Metrics import metrics
+
+REALTIME_CHANNEL = "realtime_events"
+RECONNECT_SECONDS = 5
+# Events queued while a publish round trip is in flight go out together in the next one.
+PUBLISH_BATCH = 100
+PUBLISH_QUEUE_SIZE = 10000
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; larger events go through realtime_events.
+NOTIFY_PAYLOAD_LIMIT = 7900
+SPILLED_EVENT_RETENTION = timedelta(minutes=5)
+
+Deliver = Callable[[uuid.UUID, dict], Awaitable[None]]
+
+# DBAPI drivers whose raw connections can LISTEN without blocking the event loop.
+LISTEN_DRIVERS = ("psycopg", "psycopg2")
+
+
+class Backplane:
+    """
+    Carries socket events between app processes. Each process publishes events for users who
+    may be connected elsewhere and, once started, hands events from other processes to
+    `deliver` for its own sockets.
+    """
+
+    name: str = "base"
+
+    async def start(self, deliver: Deliver) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def publish(self, user_id: uuid.UUID, payload: dict) -> None:
+        raise NotImplementedError
+
+    def publish_on_commit(self, db: Session, user_id: uuid.UUID, payload: dict) -> None:
+        """Like publish(), but sent only when the caller's transaction commits."""
+        raise NotImplementedError
+
+
+# ── Postgres ───────────────────────────────────────────────────────────────────
+
+def _notify_message(user_id: uuid.UUID, payload: dict, origin: Optional[str]) -> Optional[str]:
+    """The NOTIFY payload carrying this event, or None when it is too large to send inline."""
+    envelope = {"user_id": str(user_id), "origin": origin, "payload": payload}
+    message = json.dumps(envelope, default=str, separators=(",", ":"))
+    return message if len(message.encode()) < NOTIFY_PAYLOAD_LIMIT else None
+
+
+def notify_user(db: Session, user_id: uuid.UUID, payload: dict, origin: Optional[str] = None) -> None:
+    """
+    Queues an event for `user_id` on the caller's transaction; every listening process
+    receives it on commit, except `origin` (the process that already delivered it locally).
+    Events too large for NOTIFY are stored in realtime_events and sent by id.
+    """
+    message = _notify_message(user_id, payload, origin)
+    if message is None:
+        event = RealtimeEvent(payload=json.loads(json.dumps(payload, default=str)))
+        db.add(event)
+        db.flush()
+        db.execute(delete(RealtimeEvent).where(RealtimeEvent.created_at < func.now() - SPILLED_EVENT_RETENTION))
+        message = json.dumps({"user_id": str(user_id), "origin": origin, "event_id": str(event.id)})
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": REALTIME_CHANNEL, "payload": message})
+
+
+def _drain_notifies(conn, driver: str) -> list[str]:
+    """Payloads that have arrived on a LISTEN connection, read without blocking."""
+    if driver == "psycopg":
+        return [notify.payload for notify in conn.notifies(timeout=0)]
+    conn.poll()
+    payloads = [notify.payload for notify in conn.notifies]
+    conn.notifies.clear()
+    return payloads
+
+
+def _load_spilled_event(event_id: str) -> Optional[dict]:
+    with SessionLocal() as db:
+        event = db.get(RealtimeEvent, uuid.UUID(event_id))
+        return event.payload if event else None
+
+
+class PostgresBackplane(Backplane):
+    """
+    LISTEN/NOTIFY on one dedicated connection per process. Publishing goes through a second
+    dedicated autocommit connection: events queued while one round trip is in flight are sent
+    together in the next, as a single SELECT of several pg_notify calls. Events published by
+    this process are skipped when they come back, since they were already delivered locally.
+    """
+
+    name = "postgres"
+
+    def __init__(self) -> None:
+        self.origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._publisher: Optional[asyncio.Task] = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._publish_conn = None
+
+    async def start(self, deliver: Deliver) -> None:
+        if engine.dialect.driver not in LISTEN_DRIVERS:
+            raise ValueError(
+                f"The {self.name} backplane needs a psycopg or psycopg2 DATABASE_URL, "
+                f"not {engine.dialect.driver!r}"
+            )
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(deliver))
+
+    async def close(self) -> None:
+        if self._publisher is not None:
+            # Send what is already queued before stopping.
+            await self._outbox.join()
+        for task in (self._listener, self._publisher):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._listener = self._publisher = self._outbox = None
+        if self._publish_conn is not None:
+            self._publish_conn.close()
+            self._publish_conn = None
+
+    async def publish(self, user_id: uuid.UUID, payload: dict) -> None:
+        if self._publisher is None:
+            self._outbox = asyncio.Queue(maxsize=PUBLISH_QUEUE_SIZE)
+            self._publisher = asyncio.create_task(self._publish_loop())
+        await self._outbox.put((user_id, payload))
+
+    def publish_on_commit(self, db: Session, user_id: uuid.UUID, payload: dict) -> None:
+        notify_user(db, user_id, payload, self.origin)
+
+    async def _publish_loop(self) -> None:
+        while True:
+            batch = [await self._outbox.get()]
+            while len(batch) < PUBLISH_BATCH and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            try:
+                await asyncio.to_thread(self._send, batch)
+                metrics.observe_value("realtime_publish_batch_size", len(batch))
+            except Exception as e:
+                metrics.incr("realtime_publish_errors", len(batch), backplane=self.name)
+                print(f"[Backplane] Publish of {len(batch)} events failed: {e}")
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+
+    def _send(self, batch: list[tuple[uuid.UUID, dict]]) -> None:
+        messages = []
+        for user_id, payload in batch:
+            message = _notify_message(user_id, payload, self.origin)
+            if message is None:
+                # Rare: the event has to be stored first, which needs a regular transaction.
+                with SessionLocal() as db:
+                    notify_user(db, user_id, payload, self.origin)
+                    db.commit()
+            else:
+                messages.append(message)
+        if not messages:
+            return
+
+        if self._publish_conn is None:
+            raw = engine.raw_connection()
+            raw.detach()
+            self._publish_conn = raw.dbapi_connection
+            self._publish_conn.autocommit = True
+        try:
+            calls = ", ".join(["pg_notify(%s, %s)"] * len(messages))
+            params = [value for message in messages for value in (REALTIME_CHANNEL, message)]
+            self._publish_conn.cursor().execute(f"SELECT {calls}", params)
+        except Exception:
+            # Reconnect on the next batch.
+            self._publish_conn.close()
+            self._publish_conn = None
+            raise
+
+    async def _handle(self, message: str, deliver: Deliver) -> None:
+        envelope = json.loads(message)
+        if envelope.get("origin") == self.origin:
+            return
+        payload = envelope.get("payload")
+        if payload is None:
+            payload = await asyncio.to_thread(_load_spilled_event, envelope["event_id"])
+            if payload is None:
+                print(f"[Backplane] Spilled event {envelope['event_id']} expired before delivery")
+                return
+        metrics.incr("realtime_events_received")
+        await deliver(uuid.UUID(envelope["user_id"]), payload)
+
+    async def _listen(self, deliver: Deliver) -> None:
+        loop = asyncio.get_running_loop()
+        driver = engine.dialect.driver
+        while True:
+            raw = None
+            try:
+                raw = await asyncio.to_thread(engine.raw_connection)
+                raw.detach()
+                conn = raw.dbapi_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {REALTIME_CHANNEL}")
+
+                pending: asyncio.Queue = asyncio.Queue()
+
+                def on_readable() -> None:
+                    try:
+                        payloads = _drain_notifies(conn, driver)
+                    except Exception as e:
+                        pending.put_nowait(e)
+                        return
+                    for payload in payloads:
+                        pending.put_nowait(payload)
+
+                loop.add_reader(conn.fileno(), on_readable)
+                try:
+                    while True:
+                        item = await pending.get()
+                        if isinstance(item, Exception):
+                            raise item
+                        try:
+                            await self._handle(item, deliver)
+                        except Exception as e:
+                            print(f"[Backplane] Dropped event: {e}")
+                finally:
+                    loop.remove_reader(conn.fileno())
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Backplane] Listener stopped: {e}; reconnecting in {RECONNECT_SECONDS}s")
+                await asyncio.sleep(RECONNECT_SECONDS)
+            finally:
+                if raw is not None:
+                    raw.close()
+
+
+class LocalBackplane(PostgresBackplane):
+    """
+    Single app process: socket events are delivered locally and never published. The process
+    still listens, since events committed to the database elsewhere (analysis status from the
+    analysis workers) only arrive over NOTIFY.
+    """
+
+    name = "local"
+
+    async def publish(self, user_id: uuid.UUID, payload: dict) -> None:
+        pass
+
+    def publish_on_commit(self, db: Session, user_id: uuid.UUID, payload: dict) -> None:
+        pass
+
+
+BACKPLANES: dict[str, Callable[[], Backplane]] = {
+    "local": LocalBackplane,
+    "postgres": PostgresBackplane,
+}
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Allowance per file for multipart boundaries and part headers on top of its content.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadRejected(ValueError):
+    """The request body is not an acceptable upload; the message is safe to return to the client."""
+
+
+class UploadTooLarge(UploadRejected):
+    pass
+
+
+@dataclass
+class SpooledUpload:
+    path: Path
+    size: int
+    sha256: str
+
+    def discard(self) -> None:
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+@dataclass
+class UploadPart:
+    """One file part of a multipart upload. `upload` is None when it was not spooled."""
+
+    field: str
+    filename: str
+    content_type: str
+    upload: Optional[SpooledUpload] = None
+    too_large: bool = False
+
+
+def check_content_length(request: Request, max_bytes: int) -> None:
+    """Rejects a request whose declared body size is over `max_bytes` before any of it is read."""
+    declared = request.headers.get("content-length")
+    if declared is None:
+        return
+    try:
+        length = int(declared)
+    except ValueError:
+        raise UploadRejected("Invalid Content-Length header.")
+    if length > max_bytes:
+        raise UploadTooLarge(f"Upload is {length} bytes; limit is {max_bytes}.")
+
+
+class _PartSpooler:
+    """
+    python-multipart callbacks that write each accepted file part straight to its own temp
+    file, hashing as it goes. Parts of other content types and plain form fields are read
+    past without being stored, and a part stops being written once it crosses `max_bytes`.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, accept: frozenset[str], max_files: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.accept = accept
+        self.max_files = max_files
+        self.parts: list[UploadPart] = []
+        self._headers: dict[bytes, bytes] = {}
+        self._header_name = b""
+        self._header_value = b""
+        self._part: Optional[UploadPart] = None
+        self._out: Optional[BinaryIO] = None
+        self._path: Optional[Path] = None
+        self._digest = None
+        self._size = 0
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._part = None
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if b"filename" not in options:
+            return
+        if len(self.parts) >= self.max_files:
+            raise UploadRejected(f"Too many files. Max is {self.max_files} per request.")
+
+        part = UploadPart(
+            field=options.get(b"name", b"").decode("utf-8", errors="replace"),
+            filename=options[b"filename"].decode("utf-8", errors="replace"),
+            content_type=self._headers.get(b"content-type", b"").decode("latin-1").strip(),
+        )
+        self.parts.append(part)
+        self._part = part
+        if part.content_type in self.accept:
+            fd, name = tempfile.mkstemp(suffix=".pdf", dir=self.directory)
+            self._out = os.fdopen(fd, "wb")
+            self._path = Path(name)
+            self._digest = hashlib.sha256()
+            self._size = 0
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._out is None:
+            return
+        self._size += end - start
+        if self._size > self.max_bytes:
+            self._part.too_large = True
+            self._close_current(keep=False)
+            return
+        chunk = data[start:end]
+        self._digest.update(chunk)
+        self._out.write(chunk)
+
+    def on_part_end(self) -> None:
+        if self._out is not None:
+            self._close_current(keep=True)
+        self._part = None
+
+    def _close_current(self, keep: bool) -> None:
+        self._out.close()
+        if keep:
+            self._part.upload = SpooledUpload(path=self._path, size=self._size, sha256=self._digest.hexdigest())
+        else:
+            self._path.unlink(missing_ok=True)
+        self._out = None
+        self._path = None
+
+    def finish(self) -> None:
+        if self._out is not None:
+            # The body ended inside a file part.
+            self._close_current(keep=False)
+            raise UploadRejected("Upload ended before the file was complete.")
+
+    def discard(self) -> None:
+        if self._out is not None:
+            self._close_current(keep=False)
+        for part in self.parts:
+            if part.upload:
+                part.upload.discard()
+
+
+async def spool_multipart(
+    request: Request,
+    directory: Path,
+    max_bytes: int,
+    accept: frozenset[str],
+    max_files: int = 1,
+) -> list[UploadPart]:
+    """
+    Streams a multipart/form-data body from the socket, writing each file part of an
+    accepted content type to its own temp file in `directory` and hashing it as it goes.
+    Nothing is buffered beyond the chunk being parsed, and the request is rejected up front
+    from its Content-Length, or mid-stream once the body grows past what `max_files` files
+    of `max_bytes` each could need. Callers own the returned uploads and must discard them.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadRejected("Expected a multipart/form-data upload.")
+
+    body_limit = max_files * (max_bytes + MULTIPART_OVERHEAD)
+    check_content_length(request, body_limit)
+
+    spooler = _PartSpooler(directory, max_bytes, accept, max_files)
+    parser = MultipartParser(params[b"boundary"], spooler.callbacks())
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise UploadTooLarge(f"Upload exceeds {body_limit} bytes.")
+            parser.write(chunk)
+        parser.finalize()
+        spooler.finish()
+    except MultipartParseError as e:
+        spooler.discard()
+        raise UploadRejected("Malformed multipart upload.") from e
+    except BaseException:
+        spooler.discard()
+        raise
+
+    return spooler.parts
@@ -0,0 +1,36 @@
+"""add chat session summaries
+
+Revision ID: 0a9d3e7c1b64
+Revises: f2c6a8d4b317
+Create Date: 2026-10-18 16:12:48.904127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a9d3e7c1b64'
+down_revision: Union[str, Sequence[str], None] = 'f2c6a8d4b317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_session_summaries',
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('summary', sa.String(), nullable=False),
+    sa.Column('summarized_through', sa.DateTime(), nullable=True),
+    sa.Column('last_message_id', sa.UUID(), nullable=True),
+    sa.Column('turns_summarized', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('session_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('chat_session_summaries')
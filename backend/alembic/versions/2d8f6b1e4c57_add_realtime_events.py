@@ -0,0 +1,35 @@
+"""add realtime events
+
+Revision ID: 2d8f6b1e4c57
+Revises: 9e4b7d2c6a18
+Create Date: 2026-10-18 17:58:41.092316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8f6b1e4c57'
+down_revision: Union[str, Sequence[str], None] = '9e4b7d2c6a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('realtime_events',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_realtime_events_created_at'), 'realtime_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_realtime_events_created_at'), table_name='realtime_events')
+    op.drop_table('realtime_events')
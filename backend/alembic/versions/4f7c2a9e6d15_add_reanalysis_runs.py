@@ -0,0 +1,44 @@
+"""add reanalysis runs
+
+Revision ID: 4f7c2a9e6d15
+Revises: 6b3a9f0d2e71
+Create Date: 2026-10-18 19:02:47.316842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f7c2a9e6d15'
+down_revision: Union[str, Sequence[str], None] = '6b3a9f0d2e71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reanalysis_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('statuses', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('scanned', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('from_cache', sa.Integer(), nullable=False),
+    sa.Column('last_id', sa.UUID(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('elapsed_seconds', sa.Float(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reanalysis_runs_started_at'), 'reanalysis_runs', ['started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reanalysis_runs_started_at'), table_name='reanalysis_runs')
+    op.drop_table('reanalysis_runs')
@@ -0,0 +1,70 @@
+"""add clinical snapshots
+
+Revision ID: 5c1e8f2a9d43
+Revises: 0a9d3e7c1b64
+Create Date: 2026-10-18 16:47:22.160385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8f2a9d43'
+down_revision: Union[str, Sequence[str], None] = '0a9d3e7c1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_health_reports_user_id_created_at', 'health_reports', ['user_id', 'created_at'], unique=False)
+    op.create_table('clinical_snapshots',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('report_id', sa.UUID(), nullable=False),
+    sa.Column('report_created_at', sa.DateTime(), nullable=True),
+    sa.Column('analysis_status', sa.String(), nullable=False),
+    sa.Column('biomarkers', sa.JSON(), nullable=False),
+    sa.Column('analysis', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['report_id'], ['health_reports.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['auth_users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill from each user's newest report and that report's newest analysis.
+    op.execute("""
+        INSERT INTO clinical_snapshots
+            (user_id, report_id, report_created_at, analysis_status, biomarkers, analysis, updated_at)
+        SELECT DISTINCT ON (r.user_id)
+            r.user_id, r.id, r.created_at, r.analysis_status,
+            json_build_object(
+                'ldl_cholesterol', r.ldl_cholesterol, 'hdl_cholesterol', r.hdl_cholesterol,
+                'triglycerides', r.triglycerides, 'hba1c', r.hba1c, 'fasting_glucose', r.fasting_glucose,
+                'haemoglobin', r.haemoglobin, 'wbc_count', r.wbc_count, 'platelet_count', r.platelet_count,
+                'alt_ast', r.alt_ast, 'egfr', r.egfr, 'resting_heart_rate', r.resting_heart_rate,
+                'blood_pressure', r.blood_pressure, 'spo2', r.spo2
+            ),
+            (
+                SELECT json_build_object(
+                    'cardiac_risk_score', a.cardiac_risk_score, 'metabolic_status', a.metabolic_status,
+                    'kidney_status', a.kidney_status, 'ai_summary', a.ai_summary
+                )
+                FROM medical_analysis a
+                WHERE a.report_id = r.id
+                ORDER BY a.created_at DESC
+                LIMIT 1
+            ),
+            now()
+        FROM health_reports r
+        WHERE r.user_id IS NOT NULL
+        ORDER BY r.user_id, r.created_at DESC
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('clinical_snapshots')
+    op.drop_index('ix_health_reports_user_id_created_at', table_name='health_reports')
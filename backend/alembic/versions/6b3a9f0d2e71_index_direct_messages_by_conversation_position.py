@@ -0,0 +1,30 @@
+"""index direct messages by conversation position
+
+Revision ID: 6b3a9f0d2e71
+Revises: 2d8f6b1e4c57
+Create Date: 2026-10-18 18:34:12.587104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b3a9f0d2e71'
+down_revision: Union[str, Sequence[str], None] = '2d8f6b1e4c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_direct_messages_conversation_id_created_at_id', 'direct_messages', ['conversation_id', 'created_at', 'id'], unique=False)
+    op.drop_index(op.f('ix_direct_messages_conversation_id'), table_name='direct_messages')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_direct_messages_conversation_id'), 'direct_messages', ['conversation_id'], unique=False)
+    op.drop_index('ix_direct_messages_conversation_id_created_at_id', table_name='direct_messages')
@@ -0,0 +1,31 @@
+"""index conversations by participant and activity
+
+Revision ID: 77d434336d0c
+Revises: 8c5d1f3b7a29
+Create Date: 2026-10-18 19:51:06.418237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77d434336d0c'
+down_revision: Union[str, Sequence[str], None] = '8c5d1f3b7a29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    activity = sa.literal_column('coalesce(last_message_at, created_at) DESC')
+    op.create_index('ix_conversations_doctor_user_id_activity_id', 'conversations', ['doctor_user_id', activity, sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_conversations_patient_user_id_activity_id', 'conversations', ['patient_user_id', activity, sa.literal_column('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_conversations_patient_user_id_activity_id', table_name='conversations')
+    op.drop_index('ix_conversations_doctor_user_id_activity_id', table_name='conversations')
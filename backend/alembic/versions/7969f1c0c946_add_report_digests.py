@@ -0,0 +1,43 @@
+"""add report digests
+
+Revision ID: 7969f1c0c946
+Revises: fa07eddbbdda
+Create Date: 2026-10-18 09:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7969f1c0c946'
+down_revision: Union[str, Sequence[str], None] = 'fa07eddbbdda'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('report_digests',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('content_sha256', sa.String(length=64), nullable=False),
+    sa.Column('report_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['report_id'], ['health_reports.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['auth_users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'content_sha256', name='uq_report_digest_user_sha')
+    )
+    op.create_index(op.f('ix_report_digests_user_id'), 'report_digests', ['user_id'], unique=False)
+    op.create_index(op.f('ix_report_digests_last_used_at'), 'report_digests', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_report_digests_last_used_at'), table_name='report_digests')
+    op.drop_index(op.f('ix_report_digests_user_id'), table_name='report_digests')
+    op.drop_table('report_digests')
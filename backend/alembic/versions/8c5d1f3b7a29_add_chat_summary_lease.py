@@ -0,0 +1,30 @@
+"""add chat summary lease
+
+Revision ID: 8c5d1f3b7a29
+Revises: 4f7c2a9e6d15
+Create Date: 2026-10-18 19:27:31.062584
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c5d1f3b7a29'
+down_revision: Union[str, Sequence[str], None] = '4f7c2a9e6d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chat_session_summaries', sa.Column('lease_token', sa.UUID(), nullable=True))
+    op.add_column('chat_session_summaries', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('chat_session_summaries', 'lease_expires_at')
+    op.drop_column('chat_session_summaries', 'lease_token')
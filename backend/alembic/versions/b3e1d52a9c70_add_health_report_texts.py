@@ -0,0 +1,36 @@
+"""add health report texts
+
+Revision ID: b3e1d52a9c70
+Revises: 7969f1c0c946
+Create Date: 2026-10-18 11:02:17.846120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1d52a9c70'
+down_revision: Union[str, Sequence[str], None] = '7969f1c0c946'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('health_report_texts',
+    sa.Column('report_id', sa.UUID(), nullable=False),
+    sa.Column('encoding', sa.String(), nullable=False),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.Column('text_length', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['report_id'], ['health_reports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('report_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('health_report_texts')
@@ -0,0 +1,37 @@
+"""add analysis cache
+
+Revision ID: e81f3b6c5a92
+Revises: d4a7c9e21f08
+Create Date: 2026-10-18 14:05:33.718402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f3b6c5a92'
+down_revision: Union[str, Sequence[str], None] = 'd4a7c9e21f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analysis_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_analysis_cache_created_at'), 'analysis_cache', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_analysis_cache_created_at'), table_name='analysis_cache')
+    op.drop_table('analysis_cache')
@@ -0,0 +1,30 @@
+"""index chat messages by session and timestamp
+
+Revision ID: f2c6a8d4b317
+Revises: e81f3b6c5a92
+Create Date: 2026-10-18 15:41:09.527731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8d4b317'
+down_revision: Union[str, Sequence[str], None] = 'e81f3b6c5a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_chat_messages_session_id_timestamp', 'chat_messages', ['session_id', 'timestamp'], unique=False)
+    op.drop_index(op.f('ix_chat_messages_session_id'), table_name='chat_messages')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_chat_messages_session_id'), 'chat_messages', ['session_id'], unique=False)
+    op.drop_index('ix_chat_messages_session_id_timestamp', table_name='chat_messages')
@@ -0,0 +1,185 @@
+import random
+import re
+from typing import Optional
+
+import pytest
+
+from backend.Services.Biomarker_Scanner import FIELD_NAMES, BiomarkerScan, scan_biomarkers
+
+
+# ── golden reference: parse_health_fields as it was before the scanner ─────────
+
+def _find_float(patterns: list[str], text: str) -> Optional[float]:
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            try:
+                return float(match.group(1))
+            except ValueError:
+                continue
+    return None
+
+
+def _find_int(patterns: list[str], text: str) -> Optional[int]:
+    val = _find_float(patterns, text)
+    return int(val) if val is not None else None
+
+
+def _find_bp(text: str) -> Optional[str]:
+    match = re.search(r"Blood\s*Pressure[\s:]+(\d{2,3}/\d{2,3})", text, re.IGNORECASE)
+    if not match:
+        match = re.search(r"\b(\d{2,3}/\d{2,3}\s*mmhg)", text, re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+def legacy_parse_health_fields(text: str) -> dict:
+    return {
+        "ldl_cholesterol": _find_float([
+            r"LDL[\s\-]*Cholesterol[\s:]+(\d+\.?\d*)",
+            r"LDL[\s:]+(\d+\.?\d*)",
+            r"Low\s+Density\s+Lipoprotein[\s:]+(\d+\.?\d*)",
+        ], text),
+        "hdl_cholesterol": _find_float([
+            r"HDL[\s\-]*Cholesterol[\s:]+(\d+\.?\d*)",
+            r"HDL[\s:]+(\d+\.?\d*)",
+            r"High\s+Density\s+Lipoprotein[\s:]+(\d+\.?\d*)",
+        ], text),
+        "triglycerides": _find_float([
+            r"Triglycerides?[\s:]+(\d+\.?\d*)",
+            r"TG[\s:]+(\d+\.?\d*)",
+        ], text),
+        "hba1c": _find_float([
+            r"HbA1c[\s:]+(\d+\.?\d*)",
+            r"Glycated\s+Hae?moglobin[\s:]+(\d+\.?\d*)",
+            r"Glycohaemoglobin[\s:]+(\d+\.?\d*)",
+        ], text),
+        "fasting_glucose": _find_float([
+            r"Fasting[\s\-]*Glucose[\s:]+(\d+\.?\d*)",
+            r"Blood\s+Glucose[\s\-]*Fasting[\s:]+(\d+\.?\d*)",
+            r"FBS[\s:]+(\d+\.?\d*)",
+            r"F\.?\s*Blood\s+Sugar[\s:]+(\d+\.?\d*)",
+        ], text),
+        "haemoglobin": _find_float([
+            r"Hae?moglobin[\s:]+(\d+\.?\d*)",
+            r"\bHb[\s:]+(\d+\.?\d*)",
+            r"\bHGB[\s:]+(\d+\.?\d*)",
+        ], text),
+        "wbc_count": _find_int([
+            r"WBC[\s\-]*Count[\s:]+(\d+\.?\d*)",
+            r"White\s+Blood\s+Cell[\s\-]*Count[\s:]+(\d+\.?\d*)",
+            r"\bTLC[\s:]+(\d+\.?\d*)",
+        ], text),
+        "platelet_count": _find_int([
+            r"Platelet[\s\-]*Count[\s:]+(\d+\.?\d*)",
+            r"\bPLT[\s:]+(\d+\.?\d*)",
+        ], text),
+        "alt_ast": _find_float([
+            r"ALT[\s:]+(\d+\.?\d*)",
+            r"SGPT[\s:]+(\d+\.?\d*)",
+            r"Alanine\s+Aminotransferase[\s:]+(\d+\.?\d*)",
+        ], text),
+        "egfr": _find_float([
+            r"eGFR[\s:]+(\d+\.?\d*)",
+            r"Estimated\s+GFR[\s:]+(\d+\.?\d*)",
+        ], text),
+        "resting_heart_rate": _find_int([
+            r"(?:Resting\s+)?Heart\s+Rate[\s:]+(\d+)",
+            r"Pulse\s+Rate[\s:]+(\d+)",
+            r"\bPR[\s:]+(\d+)\s*bpm",
+        ], text),
+        "blood_pressure": _find_bp(text),
+        "spo2": _find_float([
+            r"SpO2[\s:]+(\d+\.?\d*)",
+            r"Oxygen\s+Saturation[\s:]+(\d+\.?\d*)",
+        ], text),
+    }
+
+
+# ── synthetic reports ──────────────────────────────────────────────────────────
+
+LABELS = (
+    "LDL Cholesterol", "LDL-Cholesterol", "LDL", "Low Density Lipoprotein",
+    "HDL Cholesterol", "HDL", "High Density Lipoprotein",
+    "Triglycerides", "Triglyceride", "TG",
+    "HbA1c", "Glycated Haemoglobin", "Glycated Hemoglobin", "Glycohaemoglobin",
+    "Fasting Glucose", "Blood Glucose Fasting", "FBS", "F. Blood Sugar",
+    "Haemoglobin", "Hemoglobin", "Hb", "HGB",
+    "WBC Count", "White Blood Cell Count", "TLC",
+    "Platelet Count", "PLT",
+    "ALT", "SGPT", "Alanine Aminotransferase",
+    "eGFR", "Estimated GFR",
+    "Resting Heart Rate", "Heart Rate", "Pulse Rate", "PR",
+    "Blood Pressure", "SpO2", "Oxygen Saturation",
+)
+FILLER = (
+    "Patient Name: Jane Doe", "Reference range", "Method: enzymatic", "Sample collected",
+    "Page 1 of 3", "Remarks:", "Hba", "xHb", "mg/dL", "units", "-", "\n", "  ",
+)
+
+
+def _value(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.15:
+        return f"{rng.randint(90, 180)}/{rng.randint(50, 110)}" + rng.choice(["", " mmHg", "mmhg"])
+    if roll < 0.3:
+        return f"{rng.randint(40, 120)}" + rng.choice([" bpm", "bpm", ""])
+    if roll < 0.6:
+        return str(rng.randint(1, 450000))
+    return f"{rng.uniform(0, 400):.{rng.randint(0, 2)}f}"
+
+
+def _report(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 40)):
+        if rng.random() < 0.6:
+            parts.append(rng.choice(LABELS) + rng.choice([": ", " ", ":", " : ", "\n", "  "]) + _value(rng))
+        else:
+            parts.append(rng.choice(FILLER))
+    return rng.choice([" ", "\n", "; "]).join(parts)
+
+
+def _pages(text: str, rng: random.Random) -> list[str]:
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6))))
+    return [text[a:b] for a, b in zip([0, *cuts], [*cuts, len(text)])]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_scanner_matches_legacy_parser(seed):
+    rng = random.Random(seed)
+    for _ in range(1000):
+        text = _report(rng)
+        assert scan_biomarkers(text) == legacy_parse_health_fields(text), text
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_page_fed_scan_matches_whole_text(seed):
+    rng = random.Random(1000 + seed)
+    for _ in range(1000):
+        text = _report(rng)
+        scan = BiomarkerScan()
+        for page in _pages(text, rng):
+            scan.feed(page)
+        assert scan.result() == legacy_parse_health_fields(text), text
+
+
+def test_label_and_value_split_across_pages():
+    scan = BiomarkerScan()
+    scan.feed("Lipid profile\nLDL Chole")
+    scan.feed("sterol: 1")
+    scan.feed("32.5 mg/dL\nxH")
+    scan.feed("b: 11.2\nHGB 13")
+    result = scan.result()
+    assert result["ldl_cholesterol"] == 132.5
+    assert result["haemoglobin"] == 13.0
+
+
+def test_higher_priority_alias_on_a_later_page_wins():
+    scan = BiomarkerScan()
+    scan.feed("LDL: 100\n" + "filler " * 100)
+    scan.feed("LDL Cholesterol: 120")
+    assert scan.result()["ldl_cholesterol"] == 120.0
+
+
+def test_result_has_every_field():
+    assert tuple(scan_biomarkers("")) == FIELD_NAMES
+    assert set(scan_biomarkers("").values()) == {None}
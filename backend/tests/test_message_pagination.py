@@ -0,0 +1,80 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import backend.Models  # noqa: F401
+from backend.Core.Messaging_Functions import list_messages
+from backend.DataBase.Database import Base
+from backend.Models.Auth_Data import Auth_User
+from backend.Models.Messaging import Conversation, DirectMessage
+
+
+@pytest.fixture
+def db():
+    # SQLite compares row values like Postgres, which is all (created_at, id) cursors need.
+    engine = create_engine("sqlite://")
+    tables = [Auth_User.__table__, Conversation.__table__, DirectMessage.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _seed(db: Session, groups: int, rng: random.Random) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    """A conversation whose messages come in bursts sharing one created_at, as group commit writes them."""
+    doctor_id, patient_id, conversation_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    db.execute(insert(Auth_User), [
+        {"id": doctor_id, "username": "doctor", "email": "doctor@test.invalid", "password": "x", "role": "doctor"},
+        {"id": patient_id, "username": "patient", "email": "patient@test.invalid", "password": "x", "role": "patient"},
+    ])
+    db.execute(insert(Conversation).values(
+        id=conversation_id, doctor_user_id=doctor_id, patient_user_id=patient_id, created_at=datetime(2026, 1, 1),
+    ))
+    rows = []
+    sent_at = datetime(2026, 1, 1, 9)
+    for _ in range(groups):
+        sent_at += timedelta(seconds=rng.randrange(0, 3))
+        for _ in range(rng.randint(1, 5)):
+            rows.append({
+                "id": uuid.uuid4(), "conversation_id": conversation_id, "sender_id": rng.choice([doctor_id, patient_id]),
+                "content": "hello", "is_read": False, "created_at": sent_at,
+            })
+    rng.shuffle(rows)
+    db.execute(insert(DirectMessage), rows)
+    db.commit()
+    expected = [row["id"] for row in sorted(rows, key=lambda row: (row["created_at"], row["id"]))]
+    return conversation_id, expected
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 7])
+def test_paging_back_returns_each_message_once_in_order(db, limit):
+    conversation_id, expected = _seed(db, groups=15, rng=random.Random(limit))
+
+    seen: list[uuid.UUID] = []
+    page = list_messages(db, conversation_id, limit)
+    while page:
+        assert len(page) <= limit
+        seen = [m.id for m in page] + seen
+        page = list_messages(db, conversation_id, limit, before=page[0])
+
+    assert seen == expected
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 7])
+def test_paging_forward_returns_each_message_once_in_order(db, limit):
+    conversation_id, expected = _seed(db, groups=15, rng=random.Random(100 + limit))
+
+    first = db.get(DirectMessage, expected[0])
+    seen = [first.id]
+    page = list_messages(db, conversation_id, limit, after=first)
+    while page:
+        assert len(page) <= limit
+        seen += [m.id for m in page]
+        page = list_messages(db, conversation_id, limit, after=page[-1])
+
+    assert seen == expected
+
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend.Services import Rate_Limiter
+from backend.Services.Rate_Limiter import (
+    MemoryRateLimitStore,
+    RateLimitPolicy,
+    RedisRateLimitStore,
+    enforce_rate_limit,
+)
+
+POLICY = RateLimitPolicy("test", limit=3, period_seconds=60)
+
+
+def _redis_store() -> RedisRateLimitStore:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs it for EVALSHA
+    return RedisRateLimitStore(client=fakeredis.FakeRedis())
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemoryRateLimitStore(max_keys=100)
+    return _redis_store()
+
+
+def test_allows_a_burst_then_rejects(store):
+    decisions = [store.take("user-1", POLICY) for _ in range(4)]
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert decisions[2].remaining == pytest.approx(0, abs=0.01)
+    # One token refills every 20 seconds.
+    assert decisions[3].retry_after == pytest.approx(20, abs=0.5)
+
+
+def test_keys_have_separate_buckets(store):
+    for _ in range(3):
+        store.take("user-1", POLICY)
+    assert not store.take("user-1", POLICY).allowed
+    assert store.take("user-2", POLICY).allowed
+
+
+def test_cost_spends_several_tokens(store):
+    assert store.take("user-1", POLICY, cost=2).allowed
+    assert not store.take("user-1", POLICY, cost=2).allowed
+    assert store.take("user-1", POLICY, cost=1).allowed
+
+
+def test_burst_caps_capacity(store):
+    policy = RateLimitPolicy("burst", limit=60, period_seconds=60, burst=2)
+    assert [store.take("user-1", policy).allowed for _ in range(3)] == [True, True, False]
+
+
+def test_refills_over_time(store):
+    policy = RateLimitPolicy("fast", limit=600, period_seconds=60, burst=1)  # 10 tokens per second
+    assert store.take("user-1", policy).allowed
+    assert not store.take("user-1", policy).allowed
+    time.sleep(0.15)
+    assert store.take("user-1", policy).allowed
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryRateLimitStore(max_keys=2)
+    for key in ("a", "b", "c"):
+        store.take(key, POLICY, cost=3)
+    # "a" was evicted, so it starts again from a full bucket.
+    assert store.take("a", POLICY, cost=3).allowed
+    assert not store.take("c", POLICY).allowed
+
+
+def test_redis_store_prefixes_keys_and_expires_them():
+    store = _redis_store()
+    client = store._script.registered_client
+    store.take("user-1", POLICY)
+    assert client.exists("ratelimit:user-1")
+    # Expires once the bucket would be full again: one spent token takes 20 seconds.
+    assert 0 < client.pttl("ratelimit:user-1") <= 21_000
+
+
+def test_enforce_raises_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(Rate_Limiter, "_store", MemoryRateLimitStore(max_keys=10))
+    for _ in range(3):
+        enforce_rate_limit(POLICY, "user-1")
+    with pytest.raises(HTTPException) as rejected:
+        enforce_rate_limit(POLICY, "user-1")
+    assert rejected.value.status_code == 429
+    assert rejected.value.headers["Retry-After"] == "20"
+
+
+def test_enforce_allows_requests_when_the_store_fails(monkeypatch):
+    class BrokenStore(MemoryRateLimitStore):
+        def take(self, key, policy, cost=1.0):
+            raise ConnectionError("store down")
+
+    monkeypatch.setattr(Rate_Limiter, "_store", BrokenStore(max_keys=10))
+    enforce_rate_limit(POLICY, "user-1")
@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.DataBase import Database
+from backend.Services import Realtime_Backplane as backplane
+
+
+@pytest.fixture(params=["psycopg", "psycopg2"])
+def database(request, monkeypatch):
+    """The suite's DATABASE_URL, once per LISTEN driver; skipped when it is not reachable."""
+    pytest.importorskip(request.param)
+    url = Database.engine.url.set(drivername=f"postgresql+{request.param}")
+    engine = create_engine(url)
+    try:
+        engine.connect().close()
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("DATABASE_URL is not a reachable Postgres database")
+    monkeypatch.setattr(backplane, "engine", engine)
+    monkeypatch.setattr(backplane, "SessionLocal", sessionmaker(bind=engine))
+    yield engine
+    engine.dispose()
+
+
+async def _wait_for(received: list, count: int, seconds: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + seconds
+    while len(received) < count and loop.time() < deadline:
+        await asyncio.sleep(0.05)
+
+
+def test_listener_delivers_committed_events(database):
+    user_id = uuid.uuid4()
+
+    async def scenario() -> list:
+        received = []
+
+        async def deliver(target: uuid.UUID, payload: dict) -> None:
+            received.append((target, payload))
+
+        listener = backplane.PostgresBackplane()
+        await listener.start(deliver)
+        try:
+            await asyncio.sleep(0.5)  # let the listener connect and LISTEN
+            with backplane.SessionLocal() as db:
+                for index in range(3):
+                    backplane.notify_user(db, user_id, {"type": "test", "index": index})
+                db.commit()
+            await _wait_for(received, 3)
+        finally:
+            await listener.close()
+        return received
+
+    received = asyncio.run(scenario())
+    assert received == [(user_id, {"type": "test", "index": index}) for index in range(3)]
+
+
+def test_start_rejects_a_driver_that_cannot_listen(monkeypatch):
+    monkeypatch.setattr(backplane, "engine", create_engine("sqlite://"))
+
+    async def scenario() -> None:
+        await backplane.PostgresBackplane().start(lambda user_id, payload: None)
+
+    with pytest.raises(ValueError, match="psycopg"):
+        asyncio.run(scenario())
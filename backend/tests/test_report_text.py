@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from backend.Benchmarks.Synthetic_Reports import SyntheticReport, build_report, render_pdf
+from backend.Core.Report_Text_Functions import decompress_report_text, report_text_row
+from backend.Services.Biomarker_Scanner import scan_biomarkers
+from backend.Services.PDF_Extractor import PDF_TEXT_BACKENDS, extract_health_report
+
+
+def _reports() -> list[SyntheticReport]:
+    rng = random.Random(10)
+    reports = [build_report(rng, index) for index in range(12)]
+    # A value cut across a page break: "13" ends page 1 and ".5 g/dL" starts page 2.
+    reports.append(SyntheticReport(
+        name="split_value",
+        layout="colon",
+        pages=[["MedBrief Diagnostics", "Haemoglobin: 13"], [".5 g/dL", "Platelet Count: 250000 cells/uL"]],
+    ))
+    return reports
+
+
+@pytest.mark.parametrize("backend", sorted(PDF_TEXT_BACKENDS))
+def test_reparsing_stored_text_gives_the_extracted_fields(tmp_path, backend):
+    for report in _reports():
+        path = tmp_path / f"{report.name}.pdf"
+        path.write_bytes(render_pdf(report))
+
+        extraction = extract_health_report(path, backend=backend)
+        row = report_text_row(None, extraction.text)
+        stored = decompress_report_text(row["content"], row["encoding"])
+
+        assert scan_biomarkers(stored) == extraction.fields, report.name
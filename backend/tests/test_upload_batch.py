@@ -0,0 +1,95 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from backend.Router import Medical_Data_Router as router
+from backend.Services.PDF_Executor import ExtractionResult
+
+BOUNDARY = "batchboundary"
+
+
+def _request(files: list[bytes]) -> Request:
+    body = b""
+    for index, data in enumerate(files):
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="files"; filename="report{index}.pdf"\r\n'
+            f"Content-Type: application/pdf\r\n\r\n"
+        ).encode() + data + b"\r\n"
+    body += f"--{BOUNDARY}--\r\n".encode()
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/reports/upload-batch",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    return Request(scope, receive)
+
+
+class _BlockingPool:
+    """Finishes report0.pdf at once (with no text) and holds every other extraction open."""
+
+    workers = 4
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.cancelled = 0
+        self.files_present_on_cancel = []
+        self._never = asyncio.Event()
+
+    async def extract(self, path):
+        if path.read_bytes() == b"first":
+            return ExtractionResult("", {}, 1, "fake", 0.0, 0.0)
+        self.running += 1
+        try:
+            await self._never.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            self.files_present_on_cancel.append(path.exists())
+            raise
+        finally:
+            self.running -= 1
+
+
+def test_closing_the_stream_cancels_running_extractions(tmp_path, monkeypatch):
+    monkeypatch.setattr(router, "UPLOAD_ROOT", tmp_path)
+    monkeypatch.setattr(router, "SessionLocal", lambda: SimpleNamespace(close=lambda: None))
+    monkeypatch.setattr(router, "find_cached_report", lambda db, user_id, sha256: None)
+
+    async def scenario():
+        pool = _BlockingPool()
+        monkeypatch.setattr(router, "extraction_pool", pool)
+        user = SimpleNamespace(id=uuid.uuid4(), role="patient")
+        response = await router.upload_health_reports_batch(
+            _request([b"first", b"second", b"third", b"fourth"]), patient_id=None, current_user=user
+        )
+
+        stream = response.body_iterator
+        first = json.loads(await stream.__anext__())
+        assert (first["filename"], first["status"]) == ("report0.pdf", "failed")
+        assert pool.running == 3
+
+        await stream.aclose()
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert pool.running == 0
+    assert pool.cancelled == 3
+    # Files are deleted only after the extractions reading them have stopped.
+    assert pool.files_present_on_cancel == [True, True, True]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+
+import pytest
+from starlette.requests import Request
+
+from backend.Services.Upload_Ingest import UploadRejected, UploadTooLarge, spool_multipart
+
+BOUNDARY = "testboundary"
+PDF = frozenset({"application/pdf"})
+
+
+def _body(*parts: tuple[str, str, str, bytes]) -> bytes:
+    out = b""
+    for field, filename, content_type, data in parts:
+        out += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode() + data + b"\r\n"
+    return out + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _request(body: bytes, chunk: int = 1000, content_length: int | None = None) -> tuple[Request, list]:
+    """A request streaming `body` in `chunk`-byte messages; the list records each receive() call."""
+    received = []
+
+    async def receive():
+        offset = len(received) * chunk
+        received.append(offset)
+        piece = body[offset:offset + chunk]
+        return {"type": "http.request", "body": piece, "more_body": offset + chunk < len(body)}
+
+    length = len(body) if content_length is None else content_length
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/reports/upload",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+            (b"content-length", str(length).encode()),
+        ],
+    }
+    return Request(scope, receive), received
+
+
+def _spool(request: Request, tmp_path, max_bytes: int = 10_000, max_files: int = 1):
+    return asyncio.run(spool_multipart(request, tmp_path, max_bytes, PDF, max_files))
+
+
+def test_streams_pdf_to_disk_and_hashes_it(tmp_path):
+    data = bytes(range(256)) * 30
+    request, _ = _request(_body(("file", "report.pdf", "application/pdf", data)), chunk=333)
+    [part] = _spool(request, tmp_path)
+    assert (part.field, part.filename) == ("file", "report.pdf")
+    assert part.upload.size == len(data)
+    assert part.upload.sha256 == hashlib.sha256(data).hexdigest()
+    assert part.upload.path.read_bytes() == data
+    part.upload.discard()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_on_content_length_before_reading(tmp_path):
+    request, received = _request(_body(("file", "a.pdf", "application/pdf", b"x" * 10)), content_length=10**9)
+    with pytest.raises(UploadTooLarge):
+        _spool(request, tmp_path)
+    assert received == []
+
+
+def test_oversized_and_non_pdf_parts_are_not_kept(tmp_path):
+    body = _body(
+        ("files", "big.pdf", "application/pdf", b"x" * 5000),
+        ("files", "notes.txt", "text/plain", b"hello"),
+        ("files", "ok.pdf", "application/pdf", b"%PDF-1.4"),
+    )
+    big, text, ok = _spool(_request(body)[0], tmp_path, max_bytes=1000, max_files=3)
+    assert big.too_large and big.upload is None
+    assert not text.too_large and text.upload is None
+    assert ok.upload.path.read_bytes() == b"%PDF-1.4"
+    assert list(tmp_path.iterdir()) == [ok.upload.path]
+
+
+def test_too_many_files_discards_what_was_spooled(tmp_path):
+    body = _body(*[("files", f"{i}.pdf", "application/pdf", b"%PDF") for i in range(3)])
+    with pytest.raises(UploadRejected):
+        _spool(_request(body)[0], tmp_path, max_files=2)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_truncated_body_is_rejected_and_cleaned_up(tmp_path):
+    body = _body(("file", "a.pdf", "application/pdf", b"y" * 500))[:-200]
+    with pytest.raises(UploadRejected):
+        _spool(_request(body)[0], tmp_path)
+    assert list(tmp_path.iterdir()) == []